@@ -0,0 +1 @@
+"""Repeatable performance benchmarks for Kai's core."""
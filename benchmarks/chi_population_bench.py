@@ -0,0 +1,65 @@
+"""Time :class:`CHIPopulation` against one scalar ``CHIEngine`` per agent.
+
+Usage::
+
+    python -m benchmarks.chi_population_bench --agents 2000 --steps 200
+
+Exact parity between the two is covered by
+``core/tests/chi_population_test.py``. Requires NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.chi_engine import CHIEngine
+from core.chi_population import CHIPopulation
+
+
+def _inputs(rng: random.Random, agents: int) -> Dict[str, np.ndarray]:
+    return {
+        name: np.array([rng.uniform(-0.6, 0.6) for _ in range(agents)])
+        for name in ("impact", "noise", "workload", "recovery")
+    }
+
+
+def run_benchmarks(agents: int, steps: int, seed: int) -> Dict[str, float]:
+    rng = random.Random(seed)
+    inputs = [_inputs(rng, agents) for _ in range(min(steps, 16))]
+    engines = [CHIEngine() for _ in range(agents)]
+    started = time.perf_counter()
+    for step in range(steps):
+        batch = inputs[step % len(inputs)]
+        for index, engine in enumerate(engines):
+            engine.adjust(**{name: float(values[index]) for name, values in batch.items()})
+            engine.audit()
+    scalar = time.perf_counter() - started
+
+    population = CHIPopulation(agents)
+    started = time.perf_counter()
+    for step in range(steps):
+        population.adjust(**inputs[step % len(inputs)])
+        population.audit()
+    vectorised = time.perf_counter() - started
+    return {"scalar_seconds": scalar, "population_seconds": vectorised, "speedup": scalar / vectorised}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(json.dumps({"results": run_benchmarks(args.agents, args.steps, args.seed)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Time ``RepositoryScanner`` and ``SelfAuditor`` on a synthetic repository.
+
+Usage::
+
+    python -m benchmarks.scanner_bench --output results.json
+    python -m benchmarks.scanner_bench --baseline results.json --max-regression 1.25
+
+Results are written as JSON so runs can be stored and compared. With
+``--baseline`` each operation's median is compared against the stored one
+and the command exits non-zero when any slowdown exceeds the threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from core.selfaudit import SelfAuditor
+
+from .synthetic_repo import SyntheticRepoConfig, generate_repository
+
+
+RESULT_FORMAT_VERSION = 1
+
+
+def _time(operation: Callable[[], object], repeat: int) -> Dict[str, object]:
+    runs: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        runs.append(time.perf_counter() - started)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def run_benchmarks(root: Path, repeat: int = 5, workers: int = 1) -> Dict[str, Dict[str, object]]:
+    auditor = SelfAuditor(root, workers=workers)
+    scanner = auditor.scanner
+    operations: Dict[str, Callable[[], object]] = {
+        "iter_files": lambda: sum(1 for _ in scanner.iter_files()),
+        "collect_stats": scanner.collect_stats,
+        "search_pattern": lambda: scanner.search_pattern(r"computeSomething\("),
+        "detect_high_risk_patterns": scanner.detect_high_risk_patterns,
+        "selfaudit_audit": lambda: auditor.audit(required_files=("README.md", "package.json")),
+    }
+    return {name: _time(operation, repeat) for name, operation in operations.items()}
+
+
+def compare(results: Dict[str, Dict[str, object]], baseline: Dict[str, Dict[str, object]]) -> Dict[str, float]:
+    """Return ``current / baseline`` median ratios for operations in both runs."""
+
+    ratios: Dict[str, float] = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and previous.get("median"):
+            ratios[name] = float(current["median"]) / float(previous["median"])
+    return ratios
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    defaults = SyntheticRepoConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for field in fields(SyntheticRepoConfig):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=type(getattr(defaults, field.name)),
+            default=getattr(defaults, field.name),
+        )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--root", type=Path, help="Reuse or create the synthetic tree here instead of a temp dir.")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous JSON result.")
+    parser.add_argument("--max-regression", type=float, default=1.25)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    config = SyntheticRepoConfig(**{field.name: getattr(args, field.name) for field in fields(SyntheticRepoConfig)})
+    with tempfile.TemporaryDirectory(prefix="kai-scanner-bench-") as temporary:
+        root = args.root or Path(temporary) / "repo"
+        if not root.exists():
+            generate_repository(root, config)
+        results = run_benchmarks(root, repeat=args.repeat, workers=args.workers)
+
+    payload: Dict[str, object] = {
+        "version": RESULT_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config.to_dict(),
+        "repeat": args.repeat,
+        "workers": args.workers,
+        "results": results,
+    }
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != payload["config"]:
+            print("warning: baseline was recorded with a different synthetic config", file=sys.stderr)
+        ratios = compare(results, baseline.get("results", {}))
+        payload["baseline_ratios"] = ratios
+        regressions = {name: ratio for name, ratio in ratios.items() if ratio > args.max_regression}
+        if regressions:
+            exit_code = 1
+            for name, ratio in sorted(regressions.items()):
+                print(f"regression: {name} is {ratio:.2f}x the baseline median", file=sys.stderr)
+
+    text = json.dumps(payload, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Deterministic synthetic repositories for scanner benchmarks.
+
+The generated tree mixes scannable sources with bulk inside excluded
+directories (``node_modules``, ``.git``, ``dist``) and plants high-risk
+lines at a configurable density, so every scanner code path gets exercised
+on data that is identical from one run to the next.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict
+
+
+FILLER_LINES = (
+    "const value = computeSomething(alpha, beta); // padding",
+    "export function handler(request) { return respond(request.body); }",
+    "import { useState } from 'react';",
+    "def helper(value):",
+    "    return value * 2",
+    "# Notes about the surrounding module and its behaviour.",
+    "",
+)
+RISK_LINES = (
+    "result = eval(payload)",
+    "api_key = 'not-a-real-key'",
+    "except Exception:",
+)
+EXTENSIONS = (".ts", ".tsx", ".js", ".py", ".md")
+EXCLUDED_BULK_DIRECTORIES = ("node_modules", ".git", "dist")
+
+
+@dataclass(frozen=True)
+class SyntheticRepoConfig:
+    file_count: int = 2000
+    lines_per_file: int = 120
+    depth: int = 4
+    fanout: int = 6
+    excluded_file_count: int = 4000
+    hit_density: float = 0.002
+    seed: int = 1337
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def _directory_for(rng: random.Random, root: Path, config: SyntheticRepoConfig) -> Path:
+    depth = rng.randint(0, config.depth)
+    parts = [f"pkg{rng.randrange(config.fanout)}" for _ in range(depth)]
+    return root.joinpath(*parts)
+
+
+def _file_body(rng: random.Random, config: SyntheticRepoConfig) -> str:
+    lines = []
+    for _ in range(config.lines_per_file):
+        if rng.random() < config.hit_density:
+            lines.append(rng.choice(RISK_LINES))
+        else:
+            lines.append(rng.choice(FILLER_LINES))
+    return "\n".join(lines) + "\n"
+
+
+def generate_repository(root: Path | str, config: SyntheticRepoConfig | None = None) -> Path:
+    """Write a synthetic tree under ``root`` and return its resolved path."""
+
+    config = config or SyntheticRepoConfig()
+    rng = random.Random(config.seed)
+    base = Path(root).expanduser().resolve()
+    base.mkdir(parents=True, exist_ok=True)
+    for index in range(config.file_count):
+        directory = _directory_for(rng, base, config)
+        directory.mkdir(parents=True, exist_ok=True)
+        extension = EXTENSIONS[index % len(EXTENSIONS)]
+        (directory / f"module{index}{extension}").write_text(_file_body(rng, config), encoding="utf-8")
+    for index in range(config.excluded_file_count):
+        bulk = EXCLUDED_BULK_DIRECTORIES[index % len(EXCLUDED_BULK_DIRECTORIES)]
+        directory = base / bulk / f"vendor{rng.randrange(config.fanout * 4)}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"bundle{index}.js").write_text(_file_body(rng, config), encoding="utf-8")
+    for required in ("README.md", "package.json"):
+        target = base / required
+        if not target.exists():
+            target.write_text("{}\n" if required.endswith(".json") else "# Synthetic\n", encoding="utf-8")
+    return base
+
+
+__all__ = ["SyntheticRepoConfig", "generate_repository"]
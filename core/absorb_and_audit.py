@@ -8,20 +8,73 @@ This module is the first executable layer that unifies:
 
 It does not mutate the repository blindly. It evaluates, prepares and
 produces a traceable report before any heavy integration step.
+:class:`MultiRepositoryOrchestrator` does the same for many repositories at
+once, auditing them in parallel worker processes.
 """
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Dict, Iterable, Mapping, Sequence, Tuple, TypeVar, Union
 
 from .assimilation_manifest import AssimilationManifest
-from .chi_engine import CHIEngine
-from .constitution_engine import ActionPlan, ConstitutionEngine
+from .chi_engine import CHIAudit, CHIEngine
+from .constitution_engine import ActionPlan, ConstitutionEngine, ConstitutionalVerdict
+from .report_log import ReportLog
+from .scan_cache import CacheStats
+from .scanner import ScanCounters
 from .selfaudit import SelfAuditor
 
 
+AUDIT_REQUIRED_FILES: tuple[str, ...] = ("README.md", "package.json", "src/App.tsx")
+STAGES: tuple[str, ...] = ("plan", "constitution", "chi", "audit", "manifest")
+
+Objective = Union[str, Tuple[str, Sequence[str] | None]]
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
+class StageTiming:
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class RunMetrics:
+    """What one absorption run cost.
+
+    ``stages`` holds wall-clock and CPU time per entry of :data:`STAGES`
+    (CPU time is that of the thread that ran the stage). ``io`` counts the
+    scanner's files walked, files read and bytes read during the run and
+    ``caches`` the hits, misses and hit rate of every cache consulted.
+    """
+
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+    io: dict[str, int] = field(default_factory=dict)
+    caches: dict[str, dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _Probe:
+    io: ScanCounters
+    caches: dict[str, tuple[int, int]]
+
+
+def _timed(stages: Dict[str, StageTiming], name: str, function: Callable[..., _T], *args: object) -> _T:
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        return function(*args)
+    finally:
+        stages[name] = StageTiming(time.perf_counter() - wall, time.thread_time() - cpu)
+
+
 @dataclass(slots=True)
 class AbsorptionReport:
     approved: bool
@@ -35,6 +88,9 @@ class AbsorptionReport:
     integration_targets: dict[str, list[str]]
     audit_issues: list[dict[str, object]]
     generated_at: str
+    partial: bool = False
+    timed_out_stages: list[str] = field(default_factory=list)
+    metrics: RunMetrics | None = None
 
 
 class AbsorptionOrchestrator:
@@ -47,12 +103,62 @@ class AbsorptionOrchestrator:
         constitution: ConstitutionEngine | None = None,
         chi: CHIEngine | None = None,
         manifest: AssimilationManifest | None = None,
+        cache_audits: bool = True,
+        on_metrics: Callable[[RunMetrics], None] | None = None,
     ) -> None:
         self.repository_root = Path(repository_root).expanduser().resolve()
         self.constitution = constitution or ConstitutionEngine()
         self.chi = chi or CHIEngine()
         self.manifest = manifest or AssimilationManifest()
         self.auditor = SelfAuditor(self.repository_root)
+        self.cache_audits = cache_audits
+        self._audit_cache: tuple[str, list[dict[str, object]]] | None = None
+        self._audit_lock = threading.Lock()
+        self.audit_cache_stats = CacheStats()
+        self.on_metrics = on_metrics
+        # Constitution and CHI stages of ``arun``; kept apart from the audit's
+        # executor so they never queue behind it. Threads start on first use.
+        self._stage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kai-absorb-stages")
+
+    def audit_issues(self) -> list[dict[str, object]]:
+        """Audit the repository, reusing the last result while the tree is unchanged.
+
+        The cache is keyed by the scanner's tree fingerprint, which only
+        stats files, so an unchanged repository is never read twice.
+        """
+
+        # Audits may run on executor threads (see ``arun``); one at a time
+        # keeps the scanner and its caches consistent.
+        with self._audit_lock:
+            return self._audit_locked()
+
+    def _audited(self) -> tuple[list[dict[str, object]], RunMetrics]:
+        """:meth:`audit_issues` plus the I/O and cache activity of this audit alone.
+
+        The counts are taken inside the audit lock, so an earlier audit still
+        running in the background is never charged to this one.
+        """
+
+        with self._audit_lock:
+            probe = self._probe()
+            issues = self._audit_locked()
+            return issues, self._metrics({}, probe)
+
+    def _audit_locked(self) -> list[dict[str, object]]:
+        if not self.cache_audits:
+            return [asdict(issue) for issue in self.auditor.audit(required_files=AUDIT_REQUIRED_FILES)]
+        scanner = self.auditor.scanner
+        fingerprint = scanner.tree_fingerprint(extra=[scanner.root / name for name in AUDIT_REQUIRED_FILES])
+        if self._audit_cache is None or self._audit_cache[0] != fingerprint:
+            self.audit_cache_stats.misses += 1
+            issues = [asdict(issue) for issue in self.auditor.audit(required_files=AUDIT_REQUIRED_FILES)]
+            self._audit_cache = (fingerprint, issues)
+        else:
+            self.audit_cache_stats.hits += 1
+        return [dict(issue) for issue in self._audit_cache[1]]
+
+    def invalidate_audit_cache(self) -> None:
+        self._audit_cache = None
 
     def prepare_absorption_plan(self, objective: str, extra_steps: Sequence[str] | None = None) -> ActionPlan:
         steps = [
@@ -76,22 +182,170 @@ class AbsorptionOrchestrator:
         )
 
     def run(self, objective: str, extra_steps: Sequence[str] | None = None) -> AbsorptionReport:
-        plan = self.prepare_absorption_plan(objective, extra_steps=extra_steps)
-        verdict = self.constitution.evaluate(plan)
+        probe = self._probe()
+        stages: Dict[str, StageTiming] = {}
+        audit_issues, audit_metrics = _timed(stages, "audit", self._audited)
+        return self._run(objective, extra_steps, audit_issues, stages, probe, audit_metrics)
+
+    def run_many(self, objectives: Iterable[Objective]) -> list[AbsorptionReport]:
+        """Run several objectives against a single audit of the repository.
 
+        Each objective is a string or an ``(objective, extra_steps)`` pair.
+        CHI is adjusted once per objective, in order, exactly as repeated
+        :meth:`run` calls would. The shared audit is timed in the first
+        report's metrics; later reports show a zero-cost audit stage.
+        """
+
+        probe = self._probe()
+        stages: Dict[str, StageTiming] = {}
+        audit_issues, audit_metrics = _timed(stages, "audit", self._audited)
+        reports = []
+        for objective in objectives:
+            text, extra_steps = (objective, None) if isinstance(objective, str) else objective
+            issues = [dict(issue) for issue in audit_issues]
+            reports.append(self._run(text, extra_steps, issues, stages, probe, audit_metrics))
+            probe = self._probe()
+            stages = {"audit": StageTiming()}
+            audit_metrics = self._no_audit_metrics()
+        return reports
+
+    async def arun(
+        self,
+        objective: str,
+        extra_steps: Sequence[str] | None = None,
+        *,
+        timeouts: Mapping[str, float] | None = None,
+        executor: Executor | None = None,
+    ) -> AbsorptionReport:
+        """Like :meth:`run`, with the audit overlapping the other stages.
+
+        The audit starts first on ``executor`` (the loop's default when
+        ``None``) while the constitution and CHI stages run on a thread of
+        their own, so even a single-worker executor overlaps them. ``timeouts``
+        maps stage names (``"constitution"``, ``"chi"``, ``"audit"``) to
+        seconds. A constitution or CHI timeout raises
+        :class:`asyncio.TimeoutError` because no report makes sense without
+        them. An audit that misses its deadline yields a report with
+        ``partial=True``, no audit issues and ``"audit"`` in
+        ``timed_out_stages``. The audit keeps running in the background
+        and fills the audit cache for the next run; its I/O is counted in
+        neither report.
+        """
+
+        limits = dict(timeouts or {})
+        loop = asyncio.get_running_loop()
+        probe = self._probe()
+        stages: Dict[str, StageTiming] = {}
+        # The audit may outlive this call, so it records into its own dict.
+        audit_stage: Dict[str, StageTiming] = {}
+        started = time.perf_counter()
+        audit = asyncio.shield(loop.run_in_executor(executor, _timed, audit_stage, "audit", self._audited))
+
+        plan = _timed(stages, "plan", self.prepare_absorption_plan, objective, extra_steps)
+        stage_executor = self._stage_executor
+        verdict = await asyncio.wait_for(
+            loop.run_in_executor(stage_executor, _timed, stages, "constitution", self.constitution.evaluate, plan),
+            limits.get("constitution"),
+        )
+        chi_audit = await asyncio.wait_for(
+            loop.run_in_executor(stage_executor, _timed, stages, "chi", self._adjust_chi, plan, verdict, extra_steps),
+            limits.get("chi"),
+        )
+        timed_out: list[str] = []
+        try:
+            audit_issues, audit_metrics = await asyncio.wait_for(audit, limits.get("audit"))
+            stages["audit"] = audit_stage["audit"]
+        except asyncio.TimeoutError:
+            audit_issues, audit_metrics = [], self._no_audit_metrics()
+            timed_out.append("audit")
+            stages["audit"] = StageTiming(wall_seconds=time.perf_counter() - started)
+        return self._report(verdict, chi_audit, audit_issues, stages, probe, timed_out, audit_metrics)
+
+    def _run(
+        self,
+        objective: str,
+        extra_steps: Sequence[str] | None,
+        audit_issues: list[dict[str, object]],
+        stages: Dict[str, StageTiming],
+        probe: _Probe,
+        audit_metrics: RunMetrics | None = None,
+    ) -> AbsorptionReport:
+        plan = _timed(stages, "plan", self.prepare_absorption_plan, objective, extra_steps)
+        verdict = _timed(stages, "constitution", self.constitution.evaluate, plan)
+        chi_audit = _timed(stages, "chi", self._adjust_chi, plan, verdict, extra_steps)
+        return self._report(verdict, chi_audit, audit_issues, stages, probe, audit_metrics=audit_metrics)
+
+    def _adjust_chi(
+        self,
+        plan: ActionPlan,
+        verdict: ConstitutionalVerdict,
+        extra_steps: Sequence[str] | None,
+    ) -> CHIAudit:
         workload = 0.38 if plan.touches_codebase else 0.18
         noise = 0.15 if extra_steps else 0.08
         impact = 0.22 if verdict.approved else -0.12
         self.chi.adjust(impact=impact, noise=noise, workload=workload, recovery=0.04)
-        chi_audit = self.chi.audit()
+        return self.chi.audit()
 
-        audit_issues = [asdict(issue) for issue in self.auditor.audit(required_files=(
-            "README.md",
-            "package.json",
-            "src/App.tsx",
-        ))]
+    def _cache_stats(self) -> dict[str, CacheStats]:
+        caches = {"audit": self.audit_cache_stats}
+        if self.auditor.scanner.cache is not None:
+            caches["scan"] = self.auditor.scanner.cache.stats
+        if self.auditor.python_rules is not None:
+            caches["ast_trees"] = self.auditor.python_rules.tree_stats
+        return caches
+
+    def _no_audit_metrics(self) -> RunMetrics:
+        """I/O and cache counts of a run that did no audit work of its own."""
+
+        return RunMetrics(
+            io={"files_walked": 0, "files_read": 0, "bytes_read": 0},
+            caches={name: {"hits": 0, "misses": 0, "hit_rate": 0.0} for name in self._cache_stats()},
+        )
+
+    def _probe(self) -> _Probe:
+        return _Probe(
+            io=self.auditor.scanner.io_snapshot(),
+            caches={name: (stats.hits, stats.misses) for name, stats in self._cache_stats().items()},
+        )
 
-        return AbsorptionReport(
+    def _metrics(
+        self,
+        stages: Dict[str, StageTiming],
+        probe: _Probe,
+        audit_metrics: RunMetrics | None = None,
+    ) -> RunMetrics:
+        """Metrics since ``probe``; I/O and caches of an audit run elsewhere come from ``audit_metrics``."""
+
+        io = self.auditor.scanner.io_snapshot().since(probe.io)
+        caches: dict[str, dict[str, float]] = {}
+        for name, stats in self._cache_stats().items():
+            hits, misses = probe.caches.get(name, (0, 0))
+            delta = CacheStats(hits=stats.hits - hits, misses=stats.misses - misses)
+            caches[name] = {"hits": delta.hits, "misses": delta.misses, "hit_rate": delta.hit_rate}
+        metrics = RunMetrics(
+            stages={name: stages[name] for name in STAGES if name in stages},
+            io={"files_walked": io.files_walked, "files_read": io.files_read, "bytes_read": io.bytes_read},
+            caches=caches,
+        )
+        if audit_metrics is not None:
+            metrics.io = dict(audit_metrics.io)
+            metrics.caches = dict(audit_metrics.caches)
+        return metrics
+
+    def _report(
+        self,
+        verdict: ConstitutionalVerdict,
+        chi_audit: CHIAudit,
+        audit_issues: list[dict[str, object]],
+        stages: Dict[str, StageTiming],
+        probe: _Probe,
+        timed_out_stages: Sequence[str] = (),
+        audit_metrics: RunMetrics | None = None,
+    ) -> AbsorptionReport:
+        titles, targets = _timed(stages, "manifest", lambda: (self.manifest.list_titles(), self.manifest.integration_targets()))
+        metrics = self._metrics(stages, probe, audit_metrics)
+        report = AbsorptionReport(
             approved=verdict.approved,
             constitutional_score=verdict.score,
             constitutional_reasons=verdict.reasons,
@@ -99,18 +353,205 @@ class AbsorptionOrchestrator:
             chi_snapshot=self.chi.snapshot(),
             chi_severity=chi_audit.severity,
             chi_reason=chi_audit.reason,
-            integrated_titles=self.manifest.list_titles(),
-            integration_targets=self.manifest.integration_targets(),
+            integrated_titles=titles,
+            integration_targets=targets,
             audit_issues=audit_issues,
             generated_at=datetime.utcnow().isoformat() + "Z",
+            partial=bool(timed_out_stages),
+            timed_out_stages=list(timed_out_stages),
+            metrics=metrics,
         )
+        if self.on_metrics is not None:
+            self.on_metrics(metrics)
+        return report
 
-    def export_run(self, objective: str, output_path: Path | str) -> Path:
+    def export_run(
+        self,
+        objective: str,
+        output_path: Path | str | None = None,
+        *,
+        log: ReportLog | Path | str | None = None,
+    ) -> Path:
+        """Run ``objective`` and export the report.
+
+        ``output_path`` is a report file, overwritten as before. ``log`` is a
+        :class:`ReportLog` (or its directory) the report is appended to. With
+        both, both are written and the file is returned; with only ``log``,
+        the segment the report landed in is returned.
+        """
+
+        if output_path is None and log is None:
+            raise ValueError("export_run needs an output_path, a log or both")
         report = self.run(objective)
+        segment = self._append_to_log(report, log) if log is not None else None
+        if output_path is None:
+            return segment  # type: ignore[return-value]
         destination = Path(output_path).expanduser().resolve()
         destination.parent.mkdir(parents=True, exist_ok=True)
         destination.write_text(str(asdict(report)), encoding="utf-8")
         return destination
 
+    @staticmethod
+    def _append_to_log(report: AbsorptionReport, log: ReportLog | Path | str) -> Path:
+        if isinstance(log, ReportLog):
+            return log.append(report)
+        opened = ReportLog(Path(log).expanduser().resolve())
+        try:
+            return opened.append(report)
+        finally:
+            opened.close()
+
+
+# ------------------------------------------------------------------
+# Many repositories
+# ------------------------------------------------------------------
+# Each worker process keeps one orchestrator per repository root so the
+# audit cache survives between runs whenever a root lands on the same worker.
+_WORKER_ORCHESTRATORS: Dict[str, AbsorptionOrchestrator] = {}
+
+
+def _audit_repository(root: str, cache_audits: bool) -> tuple[list[dict[str, object]], RunMetrics]:
+    orchestrator = _WORKER_ORCHESTRATORS.get(root)
+    if orchestrator is None or orchestrator.cache_audits != cache_audits:
+        orchestrator = _WORKER_ORCHESTRATORS[root] = AbsorptionOrchestrator(root, cache_audits=cache_audits)
+    stages: Dict[str, StageTiming] = {}
+    issues, metrics = _timed(stages, "audit", orchestrator._audited)
+    metrics.stages = stages
+    return issues, metrics
+
+
+@dataclass(slots=True)
+class AggregatedReport:
+    """One objective run across many repositories.
+
+    ``repositories`` maps each root to its own report, in the order the
+    roots were given; roots whose audit raised are listed in ``failures``
+    with the error instead. ``totals`` counts repositories, approvals,
+    failures and audit issues; ``wall_seconds`` is the elapsed time of the
+    whole run and ``audit_seconds`` the summed audit time of every worker.
+    """
+
+    objective: str
+    repositories: dict[str, AbsorptionReport]
+    failures: dict[str, str]
+    totals: dict[str, int]
+    issues_by_severity: dict[str, int]
+    chi_severities: dict[str, int]
+    wall_seconds: float
+    audit_seconds: float
+    generated_at: str
+
+
+class MultiRepositoryOrchestrator:
+    """Run absorption cycles over many repositories with parallel audits.
+
+    Audits, the expensive part, run in a process pool of at most
+    ``max_workers`` processes (all cores by default), so the total time
+    approaches that of the slowest repository. Plans, constitutional
+    verdicts, CHI and manifest stages stay in this process and share one
+    :class:`ConstitutionEngine` and :class:`AssimilationManifest`; each
+    repository keeps its own :class:`CHIEngine`, as separate runs would.
+    Pass ``executor`` to use an existing pool instead of an owned one.
+    """
+
+    def __init__(
+        self,
+        repository_roots: Iterable[Path | str],
+        *,
+        max_workers: int | None = None,
+        constitution: ConstitutionEngine | None = None,
+        manifest: AssimilationManifest | None = None,
+        cache_audits: bool = True,
+        executor: Executor | None = None,
+    ) -> None:
+        self.constitution = constitution or ConstitutionEngine()
+        self.manifest = manifest or AssimilationManifest()
+        self.cache_audits = cache_audits
+        self.orchestrators: Dict[str, AbsorptionOrchestrator] = {}
+        for root in repository_roots:
+            orchestrator = AbsorptionOrchestrator(
+                root, constitution=self.constitution, manifest=self.manifest, cache_audits=cache_audits
+            )
+            self.orchestrators.setdefault(str(orchestrator.repository_root), orchestrator)
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers or min(len(self.orchestrators), os.cpu_count() or 1) or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "MultiRepositoryOrchestrator":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    def run(self, objective: str, extra_steps: Sequence[str] | None = None) -> AggregatedReport:
+        started = time.perf_counter()
+        pool = self._pool()
+        futures: Dict[str, Future] = {
+            root: pool.submit(_audit_repository, root, self.cache_audits) for root in self.orchestrators
+        }
+        repositories: dict[str, AbsorptionReport] = {}
+        failures: dict[str, str] = {}
+        for root, orchestrator in self.orchestrators.items():
+            probe = orchestrator._probe()
+            try:
+                issues, audit_metrics = futures[root].result()
+            except (OSError, ValueError, RuntimeError) as error:
+                failures[root] = f"{type(error).__name__}: {error}"
+                continue
+            stages = {"audit": audit_metrics.stages["audit"]}
+            repositories[root] = orchestrator._run(objective, extra_steps, issues, stages, probe, audit_metrics)
+        return self._aggregate(objective, repositories, failures, time.perf_counter() - started)
+
+    def _aggregate(
+        self,
+        objective: str,
+        repositories: dict[str, AbsorptionReport],
+        failures: dict[str, str],
+        wall_seconds: float,
+    ) -> AggregatedReport:
+        issue_severities: Counter[str] = Counter()
+        audit_seconds = 0.0
+        for report in repositories.values():
+            issue_severities.update(str(issue.get("severity")) for issue in report.audit_issues)
+            if report.metrics is not None and "audit" in report.metrics.stages:
+                audit_seconds += report.metrics.stages["audit"].wall_seconds
+        return AggregatedReport(
+            objective=objective,
+            repositories=repositories,
+            failures=failures,
+            totals={
+                "repositories": len(self.orchestrators),
+                "completed": len(repositories),
+                "failed": len(failures),
+                "approved": sum(1 for report in repositories.values() if report.approved),
+                "audit_issues": sum(len(report.audit_issues) for report in repositories.values()),
+            },
+            issues_by_severity=dict(issue_severities),
+            chi_severities=dict(Counter(report.chi_severity for report in repositories.values())),
+            wall_seconds=wall_seconds,
+            audit_seconds=audit_seconds,
+            generated_at=datetime.utcnow().isoformat() + "Z",
+        )
+
 
-__all__ = ["AbsorptionOrchestrator", "AbsorptionReport"]
+__all__ = [
+    "AbsorptionOrchestrator",
+    "AbsorptionReport",
+    "AggregatedReport",
+    "MultiRepositoryOrchestrator",
+    "RunMetrics",
+    "StageTiming",
+]
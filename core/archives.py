@@ -0,0 +1,199 @@
+"""Read zip archive members in memory so the scanner can treat them as files.
+
+A member is addressed by a virtual path of the form
+``<archive>.zip!/<inner/path>``; it behaves like a regular :class:`Path` for
+name and suffix filtering and is how matches inside archives are reported.
+Nothing is extracted to disk. Per-archive limits bound how much a hostile or
+simply huge archive can cost: archives above ``max_archive_size`` are
+skipped, at most ``max_members`` members are listed and listing stops once
+the declared uncompressed size would exceed ``max_total_size``.
+"""
+from __future__ import annotations
+
+import os
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+
+ARCHIVE_SUFFIXES = (".zip",)
+ARCHIVE_PATTERNS = tuple(f"*{suffix}" for suffix in ARCHIVE_SUFFIXES)
+MEMBER_SEPARATOR = "!/"
+OPEN_ARCHIVES = 4
+
+
+@dataclass(frozen=True)
+class ArchiveLimits:
+    max_archive_size: Optional[int] = 256 * 1024 * 1024
+    max_members: Optional[int] = 10_000
+    max_total_size: Optional[int] = 1024 * 1024 * 1024
+
+
+def is_archive(path: Path) -> bool:
+    return path.suffix.lower() in ARCHIVE_SUFFIXES
+
+
+def member_path(archive: Path, name: str) -> Path:
+    return Path(f"{archive}{MEMBER_SEPARATOR}{name}")
+
+
+def split_member(path: Path | str) -> Optional[Tuple[Path, str]]:
+    """Return ``(archive, member name)`` for a virtual member path, else ``None``."""
+
+    text = str(path)
+    if MEMBER_SEPARATOR not in text:
+        return None
+    lowered = text.lower()
+    for suffix in ARCHIVE_SUFFIXES:
+        index = lowered.find(suffix + MEMBER_SEPARATOR)
+        if index >= 0:
+            end = index + len(suffix)
+            return Path(text[:end]), text[end + len(MEMBER_SEPARATOR):]
+    return None
+
+
+class _OpenArchives:
+    """Small per-process LRU of open archives, reopened when the file changes."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._open: "OrderedDict[Path, Tuple[Tuple[int, int], zipfile.ZipFile]]" = OrderedDict()
+
+    def get(self, archive: Path) -> Optional[zipfile.ZipFile]:
+        try:
+            stat = os.stat(archive)
+        except OSError:
+            return None
+        key = (stat.st_size, stat.st_mtime_ns)
+        entry = self._open.get(archive)
+        if entry is not None and entry[0] == key:
+            self._open.move_to_end(archive)
+            return entry[1]
+        self.discard(archive)
+        try:
+            handle = zipfile.ZipFile(archive)
+        except (OSError, zipfile.BadZipFile, zipfile.LargeZipFile, ValueError):
+            return None
+        self._open[archive] = (key, handle)
+        while len(self._open) > self.capacity:
+            _path, (_key, evicted) = self._open.popitem(last=False)
+            evicted.close()
+        return handle
+
+    def discard(self, archive: Path) -> None:
+        entry = self._open.pop(archive, None)
+        if entry is not None:
+            entry[1].close()
+
+
+_archives = _OpenArchives(OPEN_ARCHIVES)
+
+
+def iter_members(
+    archive: Path,
+    limits: ArchiveLimits,
+    accept: Callable[[PurePosixPath], bool],
+) -> Iterator[Path]:
+    """Yield virtual paths of the regular members of ``archive`` that ``accept`` allows.
+
+    Unreadable or corrupt archives yield nothing. Encrypted members and names
+    that would not survive the round trip through a :class:`Path` are skipped.
+    """
+
+    try:
+        size = os.stat(archive).st_size
+    except OSError:
+        return
+    if limits.max_archive_size is not None and size > limits.max_archive_size:
+        return
+    handle = _archives.get(archive)
+    if handle is None:
+        return
+    listed = total = 0
+    for info in handle.infolist():
+        if info.is_dir() or info.flag_bits & 0x1:
+            continue
+        inner = PurePosixPath(info.filename)
+        if inner.is_absolute() or inner.as_posix() != info.filename or not accept(inner):
+            continue
+        if limits.max_members is not None and listed >= limits.max_members:
+            return
+        total += info.file_size
+        if limits.max_total_size is not None and total > limits.max_total_size:
+            return
+        listed += 1
+        yield member_path(archive, info.filename)
+
+
+def expand_archives(
+    paths: Iterable[Path],
+    limits: ArchiveLimits,
+    accept: Callable[[PurePosixPath], bool],
+    keep: Callable[[Path], bool],
+) -> Iterator[Path]:
+    """Replace archives in ``paths`` by their accepted members.
+
+    Archives that ``keep`` approves as ordinary files are passed through as
+    well, so a ``*.zip`` file pattern still sees the archive itself.
+    """
+
+    for path in paths:
+        if is_archive(path):
+            if keep(path):
+                yield path
+            yield from iter_members(path, limits, accept)
+        else:
+            yield path
+
+
+def member_size(path: Path) -> int:
+    """Declared uncompressed size of a member, or ``0`` if it cannot be read."""
+
+    located = split_member(path)
+    handle = _archives.get(located[0]) if located is not None else None
+    if handle is None:
+        return 0
+    try:
+        return handle.getinfo(located[1]).file_size
+    except KeyError:
+        return 0
+
+
+def read_member(path: Path, max_size: Optional[int] = None) -> Optional[bytes]:
+    """Decompress a member into memory; ``None`` if missing, unreadable or too big.
+
+    The declared size is checked first and the actual read is capped as
+    well, so a member lying about its size cannot inflate past ``max_size``.
+    """
+
+    located = split_member(path)
+    handle = _archives.get(located[0]) if located is not None else None
+    if handle is None:
+        return None
+    try:
+        info = handle.getinfo(located[1])
+        if max_size is not None and info.file_size > max_size:
+            return None
+        with handle.open(info) as member:
+            data = member.read() if max_size is None else member.read(max_size + 1)
+    except (KeyError, OSError, RuntimeError, NotImplementedError, zipfile.BadZipFile, EOFError):
+        return None
+    if max_size is not None and len(data) > max_size:
+        return None
+    return data
+
+
+__all__ = [
+    "ARCHIVE_PATTERNS",
+    "ARCHIVE_SUFFIXES",
+    "ArchiveLimits",
+    "expand_archives",
+    "is_archive",
+    "iter_members",
+    "member_path",
+    "member_size",
+    "read_member",
+    "split_member",
+]
@@ -0,0 +1,241 @@
+"""Python-aware audit rules evaluated on the syntax tree.
+
+Regex rules cannot tell code from comments or strings, so ``eval`` in a
+docstring is reported like a real call. For ``*.py`` files the
+:class:`PythonRuleEngine` parses each file once and runs every registered
+rule in a single walk over the tree, dispatching nodes by type. Trees are
+cached by content hash, so unchanged or duplicated sources are parsed once.
+Sources that do not parse return ``None`` and callers fall back to the regex
+rules. Time spent in each rule is accumulated in ``timings``.
+"""
+from __future__ import annotations
+
+import abc
+import ast
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from .matches import Positions, new_positions
+from .scan_cache import CacheStats
+
+
+DEFAULT_TREE_CACHE_SIZE = 512
+PARSE_TIMING = "<parse>"
+
+_SECRET_NAME = re.compile(r"(?i)(api_key|secret|password)")
+
+
+class PythonRule(abc.ABC):
+    """One check applied to the nodes listed in ``node_types``."""
+
+    name: str = ""
+    node_types: Tuple[Type[ast.AST], ...] = ()
+
+    @abc.abstractmethod
+    def check(self, node: ast.AST) -> Sequence[ast.AST]:
+        """The offending nodes within ``node``, reported at their own lines; empty if none."""
+
+
+PYTHON_RULES: Dict[str, Type[PythonRule]] = {}
+
+
+def register_rule(rule: Type[PythonRule]) -> Type[PythonRule]:
+    """Class decorator adding ``rule`` to the rules every new engine runs."""
+
+    PYTHON_RULES[rule.name] = rule
+    return rule
+
+
+def _target_name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.keyword):
+        return node.arg
+    if isinstance(node, ast.arg):
+        return node.arg
+    return None
+
+
+def _is_literal(node: Optional[ast.AST]) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes)) and bool(node.value)
+
+
+@register_rule
+class DangerousEval(PythonRule):
+    """Calls to the ``eval`` builtin, bare or as ``builtins.eval``."""
+
+    name = "dangerous_eval"
+    node_types = (ast.Call,)
+
+    def check(self, node: ast.AST) -> Sequence[ast.AST]:
+        func = node.func  # type: ignore[attr-defined]
+        if isinstance(func, ast.Name):
+            return [node] if func.id == "eval" else []
+        builtin = (
+            isinstance(func, ast.Attribute)
+            and func.attr == "eval"
+            and isinstance(func.value, ast.Name)
+            and func.value.id in ("builtins", "__builtins__")
+        )
+        return [node] if builtin else []
+
+
+@register_rule
+class HardcodedSecret(PythonRule):
+    """Non-empty string literals bound to secret-looking names, keys, keywords or parameters.
+
+    Hits are reported at the target, key, keyword or parameter, so a dict
+    literal is flagged on the offending entry rather than its opening line.
+    """
+
+    name = "hardcoded_secret"
+    node_types = (ast.Assign, ast.AnnAssign, ast.keyword, ast.Dict, ast.arguments)
+
+    def check(self, node: ast.AST) -> Sequence[ast.AST]:
+        if isinstance(node, ast.Assign):
+            pairs = [(target, node.value) for target in node.targets]
+        elif isinstance(node, ast.AnnAssign):
+            pairs = [(node.target, node.value)]
+        elif isinstance(node, ast.keyword):
+            pairs = [(node, node.value)] if node.arg is not None else []
+        elif isinstance(node, ast.arguments):
+            positional = [*node.posonlyargs, *node.args]
+            pairs = list(zip(positional[len(positional) - len(node.defaults):], node.defaults))
+            pairs += [(arg, value) for arg, value in zip(node.kwonlyargs, node.kw_defaults) if value is not None]
+        else:
+            pairs = [(key, value) for key, value in zip(node.keys, node.values) if key is not None]  # type: ignore[attr-defined]
+        hits = []
+        for target, value in pairs:
+            name = _target_name(target)
+            if name is not None and _SECRET_NAME.search(name) and _is_literal(value):
+                hits.append(target)
+        return hits
+
+
+@register_rule
+class BroadException(PythonRule):
+    """``except Exception`` handlers, alone or inside a tuple."""
+
+    name = "broad_exception"
+    node_types = (ast.ExceptHandler,)
+
+    def check(self, node: ast.AST) -> Sequence[ast.AST]:
+        caught = node.type  # type: ignore[attr-defined]
+        names = caught.elts if isinstance(caught, ast.Tuple) else [caught]
+        return [node] if any(isinstance(name, ast.Name) and name.id == "Exception" for name in names) else []
+
+
+class PythonRuleEngine:
+    """Run a set of :class:`PythonRule` objects in one pass per parsed file."""
+
+    def __init__(
+        self,
+        rules: Optional[Iterable[PythonRule]] = None,
+        tree_cache_size: int = DEFAULT_TREE_CACHE_SIZE,
+    ) -> None:
+        self.rules: List[PythonRule] = (
+            list(rules) if rules is not None else [rule() for rule in PYTHON_RULES.values()]
+        )
+        self._dispatch: Dict[Type[ast.AST], List[PythonRule]] = {}
+        for rule in self.rules:
+            for node_type in rule.node_types:
+                self._dispatch.setdefault(node_type, []).append(rule)
+        # Salted with the hit-location scheme so cached results from rules
+        # that reported container lines are not reused.
+        names = "\0".join(f"{rule.name}={type(rule).__module__}.{type(rule).__qualname__}" for rule in self.rules)
+        self.fingerprint = hashlib.sha1(f"located-v2\0{names}".encode("utf-8")).hexdigest()
+        self.tree_cache_size = tree_cache_size
+        self._trees: "OrderedDict[bytes, Optional[ast.AST]]" = OrderedDict()
+        self.tree_stats = CacheStats()
+        self.timings: Dict[str, float] = {}
+        self.reset_timings()
+
+    def reset_timings(self) -> None:
+        self.timings = {PARSE_TIMING: 0.0, **{rule.name: 0.0 for rule in self.rules}}
+
+    # ------------------------------------------------------------------
+    def parse(self, data: bytes) -> Optional[ast.AST]:
+        """Parse ``data``, reusing the tree of identical content; ``None`` if invalid."""
+
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if digest in self._trees:
+            self.tree_stats.hits += 1
+            self._trees.move_to_end(digest)
+            return self._trees[digest]
+        self.tree_stats.misses += 1
+        started = time.perf_counter()
+        try:
+            tree: Optional[ast.AST] = ast.parse(data)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            tree = None
+        self.timings[PARSE_TIMING] += time.perf_counter() - started
+        self._trees[digest] = tree
+        if len(self._trees) > self.tree_cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    def evaluate(self, tree: ast.AST, limit: Optional[int] = None) -> Dict[str, List[int]]:
+        """Sorted line numbers hit by each rule, at most ``limit`` per rule."""
+
+        dispatch = self._dispatch
+        timings = self.timings
+        clock = time.perf_counter
+        found: Dict[str, List[int]] = {}
+        for node in ast.walk(tree):
+            rules = dispatch.get(type(node))
+            if not rules:
+                continue
+            for rule in rules:
+                started = clock()
+                hits = rule.check(node)
+                timings[rule.name] += clock() - started
+                if hits:
+                    found.setdefault(rule.name, []).extend(hit.lineno for hit in hits)  # type: ignore[attr-defined]
+        for name, linenos in found.items():
+            unique = sorted(set(linenos))
+            found[name] = unique if limit is None else unique[:limit]
+        return found
+
+    def scan(self, data: bytes, limit: Optional[int] = None) -> Optional[Dict[str, Positions]]:
+        """Rule hits in ``data`` as line numbers and line start offsets.
+
+        Rules are reported in registration order; ``None`` means the source
+        did not parse and should be checked with the regex rules instead.
+        """
+
+        tree = self.parse(data)
+        if tree is None:
+            return None
+        found = self.evaluate(tree, limit)
+        if not found:
+            return {}
+        starts = [0]
+        starts.extend(match.end() for match in re.finditer(b"\n", data))
+        hits: Dict[str, Positions] = {}
+        for rule in self.rules:
+            linenos = found.get(rule.name)
+            if linenos:
+                positions = hits[rule.name] = new_positions()
+                for lineno in linenos:
+                    positions[0].append(lineno)
+                    positions[1].append(starts[min(lineno, len(starts)) - 1])
+        return hits
+
+
+__all__ = [
+    "BroadException",
+    "DangerousEval",
+    "HardcodedSecret",
+    "PARSE_TIMING",
+    "PYTHON_RULES",
+    "PythonRule",
+    "PythonRuleEngine",
+    "register_rule",
+]
@@ -0,0 +1,160 @@
+"""Transition-only CHI alerts.
+
+Polling :meth:`~core.chi_engine.CHIEngine.audit` every cycle formats a
+timestamp and builds a :class:`~core.chi_engine.CHIAudit` even when nothing
+changed. A :class:`CHIAlertStream` attached to the engine (its ``alerts``
+argument) instead classifies each new state with a handful of float
+comparisons and calls subscribers only when the severity or the mode
+actually changes.
+
+Hysteresis keeps values hovering around a threshold from flapping: once a
+severity or mode has been entered, it is only left after the triggering
+value has moved back past the threshold by the configured band. With zero
+bands the stream reports exactly what ``audit`` and the engine's mode
+derivation would under the same :class:`~core.chi_engine.CHIThresholds`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from .chi_engine import CHIState, CHIThresholds, Mode, Severity
+
+
+@dataclass(frozen=True)
+class HysteresisBands:
+    """Margins past a threshold needed to leave a severity or mode."""
+
+    severity: float = 0.02
+    mode: float = 0.02
+
+
+@dataclass(slots=True)
+class CHIAlertEvent:
+    cycle: int
+    severity: Severity
+    previous_severity: Severity
+    mode: Mode
+    previous_mode: Mode
+    alert: Optional[str]
+    state: CHIState
+    evaluated_at: str
+
+
+Subscriber = Callable[[CHIAlertEvent], None]
+
+
+class CHIAlertStream:
+    """Classify CHI states with hysteresis and publish only the transitions."""
+
+    def __init__(
+        self,
+        bands: HysteresisBands | None = None,
+        thresholds: CHIThresholds | None = None,
+        initial_state: CHIState | None = None,
+    ) -> None:
+        self.bands = bands or HysteresisBands()
+        self.thresholds = thresholds or CHIThresholds()
+        self._own_thresholds = thresholds is not None
+        self.severity: Severity = "OPTIMO"
+        self.mode: Mode = "charla_barrio"
+        self.alert: Optional[str] = None
+        self.transitions = 0
+        self._subscribers: List[Subscriber] = []
+        if initial_state is not None:
+            self.start(initial_state)
+
+    def start(self, state: CHIState, thresholds: CHIThresholds | None = None) -> None:
+        """Take ``state`` as the current one without publishing a transition.
+
+        :class:`~core.chi_engine.CHIEngine` calls this with its initial state
+        and its thresholds, so the first ``observe`` only reports real changes
+        and later ones are classified by the engine's limits. Raises
+        :class:`ValueError` if the stream was built with different thresholds.
+        """
+
+        if thresholds is not None and thresholds != self.thresholds:
+            if self._own_thresholds:
+                raise ValueError("The alert stream was built with thresholds different from the engine's")
+            self.thresholds = thresholds
+
+        # From ``OPTIMO`` no band applies, so this is ``audit``'s plain decision.
+        self.severity = "OPTIMO"
+        self.severity, self.alert = self._classify(state)
+        self.mode = state.mode
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call ``callback`` on every transition; returns a function that unsubscribes it."""
+
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    # ------------------------------------------------------------------
+    def observe(self, state: CHIState) -> Optional[CHIAlertEvent]:
+        """Classify ``state``; notify subscribers and return the event if anything changed."""
+
+        severity, alert = self._classify(state)
+        mode = self._derive_mode(state)
+        if severity == self.severity and mode == self.mode:
+            self.alert = alert
+            return None
+        event = CHIAlertEvent(
+            cycle=state.cycle,
+            severity=severity,
+            previous_severity=self.severity,
+            mode=mode,
+            previous_mode=self.mode,
+            alert=alert,
+            state=replace(state),
+            evaluated_at=datetime.utcnow().isoformat() + "Z",
+        )
+        self.severity, self.mode, self.alert = severity, mode, alert
+        self.transitions += 1
+        for callback in list(self._subscribers):
+            callback(event)
+        return event
+
+    def _classify(self, state: CHIState) -> Tuple[Severity, Optional[str]]:
+        """``audit``'s decision, with thresholds relaxed in favour of the current severity."""
+
+        limits = self.thresholds
+        current = self.severity
+        band = self.bands.severity
+        critical_band = band if current == "CRITICO" else 0.0
+        alert_band = band if current != "OPTIMO" else 0.0
+        if state.coherence < limits.critical_coherence + critical_band:
+            return "CRITICO", "COHERENCIA_BAJA"
+        if (
+            state.entropy > limits.saturated_entropy - alert_band
+            or state.fatigue > limits.saturated_fatigue - alert_band
+        ):
+            return "ALERTA", "SATURACION_OPERATIVA"
+        if state.energy < limits.low_energy + alert_band:
+            return "ALERTA", "ENERGIA_BAJA"
+        return "OPTIMO", None
+
+    def _derive_mode(self, state: CHIState) -> Mode:
+        """The engine's mode rules, with the current mode's own rule relaxed by the band."""
+
+        limits = self.thresholds
+        current = self.mode
+        band = self.bands.mode
+        safe = band if current == "modo_seguro" else 0.0
+        if state.coherence < limits.safe_mode_coherence + safe or state.entropy > limits.safe_mode_entropy - safe:
+            return "modo_seguro"
+        rest = band if current == "reposo" else 0.0
+        if state.fatigue > limits.rest_fatigue - rest or state.energy < limits.rest_energy + rest:
+            return "reposo"
+        focus = band if current == "foco" else 0.0
+        if state.coherence > limits.focus_coherence - focus and state.entropy < limits.focus_entropy + focus:
+            return "foco"
+        return "charla_barrio"
+
+
+__all__ = ["CHIAlertEvent", "CHIAlertStream", "HysteresisBands"]
@@ -7,11 +7,18 @@ from __future__ import annotations
 
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Literal
+from typing import TYPE_CHECKING, Literal, get_args
+
+if TYPE_CHECKING:
+    from .chi_alerts import CHIAlertStream
+    from .chi_history import CHIHistory
+    from .chi_journal import CHIJournal
 
 
 Severity = Literal["OPTIMO", "ALERTA", "CRITICO"]
 Mode = Literal["charla_barrio", "foco", "reposo", "modo_seguro"]
+MODES: tuple[Mode, ...] = get_args(Mode)
+ALERTS: tuple[str | None, ...] = (None, "COHERENCIA_BAJA", "SATURACION_OPERATIVA", "ENERGIA_BAJA", "RESTAURADO")
 
 
 @dataclass(slots=True)
@@ -25,6 +32,26 @@ class CHIState:
     last_alert: str | None = None
 
 
+@dataclass(frozen=True)
+class CHIThresholds:
+    """The boundaries used by ``audit`` and mode derivation.
+
+    :class:`CHIEngine`, populations and alert streams all take an instance;
+    the defaults are the engine's standard limits.
+    """
+
+    critical_coherence: float = 0.45
+    saturated_entropy: float = 0.72
+    saturated_fatigue: float = 0.68
+    low_energy: float = 0.35
+    safe_mode_coherence: float = 0.45
+    safe_mode_entropy: float = 0.82
+    rest_fatigue: float = 0.7
+    rest_energy: float = 0.3
+    focus_coherence: float = 0.82
+    focus_entropy: float = 0.35
+
+
 @dataclass(slots=True)
 class CHIAudit:
     severity: Severity
@@ -35,10 +62,35 @@ class CHIAudit:
 
 
 class CHIEngine:
-    """Maintain and audit Kai's internal homeostasis."""
-
-    def __init__(self, initial_state: CHIState | None = None) -> None:
+    """Maintain and audit Kai's internal homeostasis.
+
+    With a :class:`~core.chi_history.CHIHistory` as ``history``, the state
+    after every ``adjust`` and ``restore`` is recorded into it; with a
+    :class:`~core.chi_journal.CHIJournal` as ``journal``, the calls
+    themselves are journalled for replay; and a
+    :class:`~core.chi_alerts.CHIAlertStream` as ``alerts`` is told about each
+    new state so it can publish severity and mode transitions.
+    ``thresholds`` replaces the standard limits of ``audit`` and the mode
+    derivation.
+    """
+
+    def __init__(
+        self,
+        initial_state: CHIState | None = None,
+        history: CHIHistory | None = None,
+        journal: CHIJournal | None = None,
+        alerts: CHIAlertStream | None = None,
+        thresholds: CHIThresholds | None = None,
+    ) -> None:
         self.state = initial_state or CHIState()
+        self.thresholds = thresholds or CHIThresholds()
+        self.history = history
+        self.journal = journal
+        self.alerts = alerts
+        if journal is not None:
+            journal.start(self.state)
+        if alerts is not None:
+            alerts.start(self.state, self.thresholds)
 
     @staticmethod
     def _clamp(value: float) -> float:
@@ -60,10 +112,17 @@ class CHIEngine:
         self.state.entropy = self._clamp(self.state.entropy + (noise * 0.45) + (workload * 0.2) - (recovery * 0.2))
         self.state.fatigue = self._clamp(self.state.fatigue + (workload * 0.4) - (recovery * 0.3))
         self.state.mode = self._derive_mode()
+        if self.history is not None:
+            self.history.record(self.state)
+        if self.journal is not None:
+            self.journal.record_adjust(self.state, impact, noise, workload, recovery)
+        if self.alerts is not None:
+            self.alerts.observe(self.state)
         return self.state
 
     def audit(self) -> CHIAudit:
-        if self.state.coherence < 0.45:
+        limits = self.thresholds
+        if self.state.coherence < limits.critical_coherence:
             self.state.last_alert = "COHERENCIA_BAJA"
             return CHIAudit(
                 severity="CRITICO",
@@ -73,7 +132,7 @@ class CHIEngine:
                 evaluated_at=datetime.utcnow().isoformat() + "Z",
             )
 
-        if self.state.entropy > 0.72 or self.state.fatigue > 0.68:
+        if self.state.entropy > limits.saturated_entropy or self.state.fatigue > limits.saturated_fatigue:
             self.state.last_alert = "SATURACION_OPERATIVA"
             return CHIAudit(
                 severity="ALERTA",
@@ -83,7 +142,7 @@ class CHIEngine:
                 evaluated_at=datetime.utcnow().isoformat() + "Z",
             )
 
-        if self.state.energy < 0.35:
+        if self.state.energy < limits.low_energy:
             self.state.last_alert = "ENERGIA_BAJA"
             return CHIAudit(
                 severity="ALERTA",
@@ -111,19 +170,26 @@ class CHIEngine:
         self.state.fatigue = self._clamp(self.state.fatigue - 0.14)
         self.state.mode = self._derive_mode()
         self.state.last_alert = "RESTAURADO"
+        if self.history is not None:
+            self.history.record(self.state)
+        if self.journal is not None:
+            self.journal.record_restore(self.state)
+        if self.alerts is not None:
+            self.alerts.observe(self.state)
         return self.state
 
     def snapshot(self) -> dict[str, object]:
         return asdict(self.state)
 
     def _derive_mode(self) -> Mode:
-        if self.state.coherence < 0.45 or self.state.entropy > 0.82:
+        limits = self.thresholds
+        if self.state.coherence < limits.safe_mode_coherence or self.state.entropy > limits.safe_mode_entropy:
             return "modo_seguro"
-        if self.state.fatigue > 0.7 or self.state.energy < 0.3:
+        if self.state.fatigue > limits.rest_fatigue or self.state.energy < limits.rest_energy:
             return "reposo"
-        if self.state.coherence > 0.82 and self.state.entropy < 0.35:
+        if self.state.coherence > limits.focus_coherence and self.state.entropy < limits.focus_entropy:
             return "foco"
         return "charla_barrio"
 
 
-__all__ = ["CHIEngine", "CHIState", "CHIAudit"]
+__all__ = ["CHIEngine", "CHIState", "CHIAudit", "CHIThresholds", "ALERTS", "MODES"]
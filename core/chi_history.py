@@ -0,0 +1,180 @@
+"""Bounded, allocation-free record of how CHI evolves.
+
+:class:`CHIHistory` keeps the last ``capacity`` cycles at full resolution in
+preallocated :mod:`array` buffers used as a ring. Every ``bucket_size``
+cycles are also folded into one min/max/mean bucket, and the last
+``bucket_capacity`` buckets are kept in a second ring, so a long horizon is
+available at coarse resolution while memory stays fixed from the start.
+Attach one to :class:`~core.chi_engine.CHIEngine` through its ``history``
+argument and every ``adjust`` and ``restore`` is recorded.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .chi_engine import MODES
+
+if TYPE_CHECKING:
+    from .chi_engine import CHIState
+
+
+FIELDS: tuple[str, ...] = ("energy", "coherence", "entropy", "fatigue")
+DEFAULT_CAPACITY = 4096
+DEFAULT_BUCKET_SIZE = 64
+DEFAULT_BUCKET_CAPACITY = 4096
+
+_MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+
+
+def _zeros(typecode: str, length: int) -> array:
+    return array(typecode, bytes(array(typecode).itemsize * length))
+
+
+def _ring_slice(buffer: array, end: int, count: int, last: int) -> array:
+    """The ``last`` newest of ``count`` entries of a ring whose next write goes to ``end``."""
+
+    last = max(0, min(last, count))
+    start = end - last
+    if start >= 0:
+        return buffer[start:end]
+    return buffer[start + len(buffer):] + buffer[:end]
+
+
+@dataclass(slots=True)
+class DownsampledSeries:
+    """One field over consecutive buckets; ``cycles`` holds each bucket's first cycle."""
+
+    cycles: array
+    minimum: array
+    maximum: array
+    mean: array
+
+
+class CHIHistory:
+    """Fixed-capacity CHI history with full-resolution and bucketed tiers."""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        bucket_size: int = DEFAULT_BUCKET_SIZE,
+        bucket_capacity: int = DEFAULT_BUCKET_CAPACITY,
+    ) -> None:
+        if capacity < 1 or bucket_size < 1 or bucket_capacity < 1:
+            raise ValueError("History capacities and bucket size must be positive")
+        self.capacity = capacity
+        self.bucket_size = bucket_size
+        self.bucket_capacity = bucket_capacity
+        self._cycles = _zeros("q", capacity)
+        self._modes = _zeros("b", capacity)
+        self._values: Dict[str, array] = {name: _zeros("d", capacity) for name in FIELDS}
+        self._columns = tuple(self._values[name] for name in FIELDS)
+        self._next = 0
+        self._count = 0
+        self.recorded = 0
+
+        self._bucket_cycles = _zeros("q", bucket_capacity)
+        self._bucket_min = {name: _zeros("d", bucket_capacity) for name in FIELDS}
+        self._bucket_max = {name: _zeros("d", bucket_capacity) for name in FIELDS}
+        self._bucket_mean = {name: _zeros("d", bucket_capacity) for name in FIELDS}
+        self._bucket_next = 0
+        self._bucket_count = 0
+        self._pending = 0
+        self._pending_cycle = 0
+        self._pending_min = [0.0] * len(FIELDS)
+        self._pending_max = [0.0] * len(FIELDS)
+        self._pending_sum = [0.0] * len(FIELDS)
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------
+    def record(self, state: CHIState) -> None:
+        """Store one cycle of ``state``; the oldest full-resolution cycle is overwritten when full."""
+
+        index = self._next
+        values = (state.energy, state.coherence, state.entropy, state.fatigue)
+        self._cycles[index] = state.cycle
+        self._modes[index] = _MODE_CODES[state.mode]
+        energy, coherence, entropy, fatigue = self._columns
+        energy[index], coherence[index], entropy[index], fatigue[index] = values
+        index += 1
+        self._next = 0 if index == self.capacity else index
+        if self._count < self.capacity:
+            self._count += 1
+        self.recorded += 1
+
+        if self._pending == 0:
+            self._pending_cycle = state.cycle
+            self._pending_min[:] = values
+            self._pending_max[:] = values
+            self._pending_sum[:] = values
+        else:
+            low, high, total = self._pending_min, self._pending_max, self._pending_sum
+            for position in range(4):
+                value = values[position]
+                if value < low[position]:
+                    low[position] = value
+                elif value > high[position]:
+                    high[position] = value
+                total[position] += value
+        self._pending += 1
+        if self._pending == self.bucket_size:
+            self._close_bucket()
+
+    def _close_bucket(self) -> None:
+        index = self._bucket_next
+        self._bucket_cycles[index] = self._pending_cycle
+        for position, name in enumerate(FIELDS):
+            self._bucket_min[name][index] = self._pending_min[position]
+            self._bucket_max[name][index] = self._pending_max[position]
+            self._bucket_mean[name][index] = self._pending_sum[position] / self._pending
+        self._bucket_next = (index + 1) % self.bucket_capacity
+        if self._bucket_count < self.bucket_capacity:
+            self._bucket_count += 1
+        self._pending = 0
+
+    # ------------------------------------------------------------------
+    def window(self, field: str, last: Optional[int] = None) -> array:
+        """Values of ``field`` over the ``last`` recorded cycles (all retained when ``None``), oldest first."""
+
+        if field not in self._values:
+            raise KeyError(f"Unknown CHI field {field!r}")
+        return _ring_slice(self._values[field], self._next, self._count, self._count if last is None else last)
+
+    def cycles(self, last: Optional[int] = None) -> array:
+        return _ring_slice(self._cycles, self._next, self._count, self._count if last is None else last)
+
+    def modes(self, last: Optional[int] = None) -> List[str]:
+        codes = _ring_slice(self._modes, self._next, self._count, self._count if last is None else last)
+        return [MODES[code] for code in codes]
+
+    def summary(self, field: str, last: Optional[int] = None) -> Optional[tuple[float, float, float]]:
+        """``(min, max, mean)`` of ``field`` over the window, or ``None`` when it is empty."""
+
+        values = self.window(field, last)
+        if not values:
+            return None
+        return min(values), max(values), sum(values) / len(values)
+
+    def downsampled(self, field: str, last: Optional[int] = None) -> DownsampledSeries:
+        """The ``last`` completed buckets of ``field``; the bucket being filled is not included."""
+
+        if field not in self._bucket_mean:
+            raise KeyError(f"Unknown CHI field {field!r}")
+        count = self._bucket_count if last is None else last
+        end, total = self._bucket_next, self._bucket_count
+        return DownsampledSeries(
+            cycles=_ring_slice(self._bucket_cycles, end, total, count),
+            minimum=_ring_slice(self._bucket_min[field], end, total, count),
+            maximum=_ring_slice(self._bucket_max[field], end, total, count),
+            mean=_ring_slice(self._bucket_mean[field], end, total, count),
+        )
+
+    def clear(self) -> None:
+        self._next = self._count = self.recorded = 0
+        self._bucket_next = self._bucket_count = self._pending = 0
+
+
+__all__ = ["CHIHistory", "DownsampledSeries", "FIELDS"]
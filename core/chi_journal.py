@@ -0,0 +1,257 @@
+"""Binary journal of CHI inputs with checkpointed replay.
+
+A :class:`CHIJournal` attached to :class:`~core.chi_engine.CHIEngine` appends
+one fixed-size record per ``adjust`` or ``restore`` call: the cycle, the
+kind of call and its four inputs (41 bytes). Every ``checkpoint_interval``
+records the full state is written to a companion ``.ckpt`` file, also as
+fixed-size entries, so checkpoint ``k`` always describes the state after
+record ``k * checkpoint_interval``. :class:`CHIReplay` uses this to rebuild the
+state at any record or cycle by loading the nearest earlier checkpoint and
+re-applying at most ``checkpoint_interval`` records, then steps forward from
+there.
+
+``audit`` calls are not journalled, so a replayed ``last_alert`` reflects
+checkpoints and restores only; energy, coherence, entropy, fatigue, cycle
+and mode are reproduced exactly as long as the replay is given the
+:class:`~core.chi_engine.CHIThresholds` of the engine that wrote the journal.
+"""
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from .chi_engine import ALERTS, MODES, CHIEngine, CHIState, CHIThresholds
+
+
+JOURNAL_MAGIC = b"KAICHIJ1"
+CHECKPOINT_MAGIC = b"KAICHIC1"
+DEFAULT_CHECKPOINT_INTERVAL = 4096
+
+ADJUST = 0
+RESTORE = 1
+
+_RECORD = struct.Struct("<qB4d")
+_CHECKPOINT = struct.Struct("<qq4dbb")
+_HEADER = len(JOURNAL_MAGIC)
+
+
+class JournalRecord(NamedTuple):
+    index: int
+    cycle: int
+    kind: int
+    impact: float
+    noise: float
+    workload: float
+    recovery: float
+
+
+def _open(path: Path, magic: bytes) -> BinaryIO:
+    handle = open(path, "a+b")
+    handle.seek(0, os.SEEK_END)
+    if handle.tell() == 0:
+        handle.write(magic)
+        handle.flush()
+    else:
+        handle.seek(0)
+        if handle.read(len(magic)) != magic:
+            handle.close()
+            raise ValueError(f"{path} is not a CHI journal file")
+    return handle
+
+
+class CHIJournal:
+    """Append-only record of CHI inputs plus periodic state checkpoints.
+
+    Pass it as ``journal`` to :class:`CHIEngine`; the engine writes the
+    initial checkpoint and one record per call. Reopening an existing
+    journal continues it, so the engine should resume from
+    :meth:`CHIReplay.seek` at its end. A trailing partial record left by a
+    crash is dropped on open.
+    """
+
+    def __init__(self, path: Path | str, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be positive")
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_path = self.path.with_name(self.path.name + ".ckpt")
+        self.checkpoint_interval = checkpoint_interval
+        self._records = _open(self.path, JOURNAL_MAGIC)
+        self._checkpoints = _open(self.checkpoint_path, CHECKPOINT_MAGIC)
+        self.count = self._trim(self._records, _RECORD.size)
+        self.checkpoints = self._trim(self._checkpoints, _CHECKPOINT.size)
+        # Checkpoints past the last record belong to records lost in a crash.
+        expected = self.count // checkpoint_interval + 1 if self.count or self.checkpoints else 0
+        if self.checkpoints > expected:
+            self._checkpoints.truncate(_HEADER + expected * _CHECKPOINT.size)
+            self.checkpoints = expected
+
+    @staticmethod
+    def _trim(handle: BinaryIO, size: int) -> int:
+        end = handle.seek(0, os.SEEK_END)
+        count, extra = divmod(end - _HEADER, size)
+        if extra:
+            handle.truncate(end - extra)
+        return count
+
+    # ------------------------------------------------------------------
+    def start(self, state: CHIState) -> None:
+        """Write checkpoint 0 for a new journal; existing journals are left alone."""
+
+        if self.count == 0 and self.checkpoints == 0:
+            self._checkpoint(state)
+
+    def record_adjust(self, state: CHIState, impact: float, noise: float, workload: float, recovery: float) -> None:
+        """Journal an ``adjust`` call, given the state it produced."""
+
+        self._records.write(_RECORD.pack(state.cycle, ADJUST, impact, noise, workload, recovery))
+        self.count += 1
+        if self.count % self.checkpoint_interval == 0:
+            self._checkpoint(state)
+
+    def record_restore(self, state: CHIState) -> None:
+        self._records.write(_RECORD.pack(state.cycle, RESTORE, 0.0, 0.0, 0.0, 0.0))
+        self.count += 1
+        if self.count % self.checkpoint_interval == 0:
+            self._checkpoint(state)
+
+    def _checkpoint(self, state: CHIState) -> None:
+        self._checkpoints.write(
+            _CHECKPOINT.pack(
+                self.count,
+                state.cycle,
+                state.energy,
+                state.coherence,
+                state.entropy,
+                state.fatigue,
+                MODES.index(state.mode),
+                ALERTS.index(state.last_alert),
+            )
+        )
+        self.checkpoints += 1
+
+    def flush(self) -> None:
+        self._records.flush()
+        self._checkpoints.flush()
+
+    def close(self) -> None:
+        self._records.close()
+        self._checkpoints.close()
+
+    def __enter__(self) -> "CHIJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    def read_record(self, index: int) -> JournalRecord:
+        self._records.flush()
+        self._records.seek(_HEADER + index * _RECORD.size)
+        return JournalRecord(index, *_RECORD.unpack(self._records.read(_RECORD.size)))
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[JournalRecord]:
+        """Records ``start`` up to ``stop`` (exclusive), read in one sequential pass."""
+
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return
+        self._records.flush()
+        self._records.seek(_HEADER + start * _RECORD.size)
+        data = self._records.read((stop - start) * _RECORD.size)
+        for offset, values in enumerate(_RECORD.iter_unpack(data)):
+            yield JournalRecord(start + offset, *values)
+
+    def read_checkpoint(self, number: int) -> tuple[int, CHIState]:
+        """``(records applied, state)`` of checkpoint ``number``."""
+
+        self._checkpoints.flush()
+        self._checkpoints.seek(_HEADER + number * _CHECKPOINT.size)
+        applied, cycle, energy, coherence, entropy, fatigue, mode, alert = _CHECKPOINT.unpack(
+            self._checkpoints.read(_CHECKPOINT.size)
+        )
+        state = CHIState(
+            energy=energy,
+            coherence=coherence,
+            entropy=entropy,
+            fatigue=fatigue,
+            cycle=cycle,
+            mode=MODES[mode],
+            last_alert=ALERTS[alert],
+        )
+        return applied, state
+
+    def records_through_cycle(self, cycle: int) -> int:
+        """How many records have a cycle at or below ``cycle`` (binary search over the file)."""
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.read_record(middle).cycle <= cycle:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class CHIReplay:
+    """Rebuild and step through the states recorded in a :class:`CHIJournal`.
+
+    Modes are derived again while replaying, so ``thresholds`` must be those
+    of the engine that wrote the journal.
+    """
+
+    def __init__(self, journal: CHIJournal, thresholds: CHIThresholds | None = None) -> None:
+        if journal.checkpoints == 0:
+            raise ValueError("Journal has no checkpoint to replay from")
+        self.journal = journal
+        self.thresholds = thresholds or CHIThresholds()
+        self.engine = CHIEngine(thresholds=self.thresholds)
+        self.position = 0
+        self.seek(record=0)
+
+    @property
+    def state(self) -> CHIState:
+        return self.engine.state
+
+    def seek(self, cycle: Optional[int] = None, *, record: Optional[int] = None) -> CHIState:
+        """Move to the state after ``record`` records, or after the last record of ``cycle``.
+
+        Without arguments, moves to the end of the journal.
+        """
+
+        journal = self.journal
+        if record is None:
+            record = journal.count if cycle is None else journal.records_through_cycle(cycle)
+        record = max(0, min(record, journal.count))
+        number = min(record // journal.checkpoint_interval, journal.checkpoints - 1)
+        applied, state = journal.read_checkpoint(number)
+        while applied > record and number > 0:
+            # Only after a crash lost a checkpoint, shifting the later ones.
+            number -= 1
+            applied, state = journal.read_checkpoint(number)
+        self.engine = CHIEngine(state, thresholds=self.thresholds)
+        self.position = applied
+        return self._apply(record)
+
+    def step(self, count: int = 1) -> CHIState:
+        """Apply the next ``count`` journalled calls."""
+
+        return self._apply(min(self.position + count, self.journal.count))
+
+    def _apply(self, target: int) -> CHIState:
+        engine = self.engine
+        for entry in self.journal.iter_records(self.position, target):
+            if entry.kind == RESTORE:
+                engine.restore()
+            else:
+                engine.adjust(
+                    impact=entry.impact, noise=entry.noise, workload=entry.workload, recovery=entry.recovery
+                )
+        self.position = max(self.position, target)
+        return engine.state
+
+
+__all__ = ["ADJUST", "CHIJournal", "CHIReplay", "JournalRecord", "RESTORE"]
@@ -0,0 +1,183 @@
+"""Vectorised CHI for many agents at once.
+
+:class:`CHIPopulation` keeps energy, coherence, entropy and fatigue of every
+agent in NumPy arrays (mode and last alert as small integer codes) and
+applies :meth:`~core.chi_engine.CHIEngine.adjust`,
+:meth:`~core.chi_engine.CHIEngine.restore`,
+:meth:`~core.chi_engine.CHIEngine.audit` and the mode derivation to all of
+them in one step. Each agent ends up bit-for-bit where a scalar
+:class:`~core.chi_engine.CHIEngine` with the same :class:`CHIThresholds` fed
+the same inputs would be: the arithmetic runs in the same order on float64, and
+rounding reproduces Python's correctly rounded ``round(value, 4)``.
+
+NumPy is optional for Kai; it is only imported when a population is built.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Sequence, Union
+
+from .chi_engine import ALERTS, MODES, CHIEngine, CHIState, CHIThresholds
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+SEVERITIES: tuple[str, ...] = ("OPTIMO", "ALERTA", "CRITICO")
+
+CHARLA_BARRIO, FOCO, REPOSO, MODO_SEGURO = range(4)
+OPTIMO, ALERTA, CRITICO = range(3)
+NO_ALERT, COHERENCIA_BAJA, SATURACION_OPERATIVA, ENERGIA_BAJA, RESTAURADO = range(5)
+
+# ``x * 1e4`` is off from the exact product by far less than this, so only
+# values this close to a rounding tie can round differently from ``round()``.
+_TIE_TOLERANCE = 1e-6
+
+Inputs = Union[float, "np.ndarray"]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as error:  # pragma: no cover - depends on the environment
+        raise ImportError("CHIPopulation requires NumPy (pip install numpy)") from error
+    return numpy
+
+
+class CHIPopulation:
+    """``size`` independent CHI states advanced together."""
+
+    def __init__(
+        self,
+        size: int,
+        initial_state: CHIState | None = None,
+        thresholds: CHIThresholds | None = None,
+    ) -> None:
+        np = self._np = _numpy()
+        state = initial_state or CHIState()
+        self.size = size
+        self.thresholds = thresholds or CHIThresholds()
+        self.cycle = state.cycle
+        self.energy = np.full(size, state.energy, dtype=np.float64)
+        self.coherence = np.full(size, state.coherence, dtype=np.float64)
+        self.entropy = np.full(size, state.entropy, dtype=np.float64)
+        self.fatigue = np.full(size, state.fatigue, dtype=np.float64)
+        self.mode = np.full(size, MODES.index(state.mode), dtype=np.int8)
+        self.last_alert = np.full(size, ALERTS.index(state.last_alert), dtype=np.int8)
+
+    @classmethod
+    def from_states(cls, states: Sequence[CHIState], thresholds: CHIThresholds | None = None) -> "CHIPopulation":
+        """Build a population from individual states, which must share one cycle."""
+
+        if len({state.cycle for state in states}) > 1:
+            raise ValueError("All states of a population must be at the same cycle")
+        population = cls(len(states), states[0] if states else None, thresholds)
+        np = population._np
+        population.energy = np.array([state.energy for state in states], dtype=np.float64)
+        population.coherence = np.array([state.coherence for state in states], dtype=np.float64)
+        population.entropy = np.array([state.entropy for state in states], dtype=np.float64)
+        population.fatigue = np.array([state.fatigue for state in states], dtype=np.float64)
+        population.mode = np.array([MODES.index(state.mode) for state in states], dtype=np.int8)
+        population.last_alert = np.array([ALERTS.index(state.last_alert) for state in states], dtype=np.int8)
+        return population
+
+    @classmethod
+    def from_engines(cls, engines: Iterable[CHIEngine], thresholds: CHIThresholds | None = None) -> "CHIPopulation":
+        return cls.from_states([engine.state for engine in engines], thresholds)
+
+    # ------------------------------------------------------------------
+    def _clamp(self, values: "np.ndarray") -> "np.ndarray":
+        """Element-wise ``max(0.0, min(1.0, round(value, 4)))``."""
+
+        np = self._np
+        scaled = values * 1e4
+        rounded = np.rint(scaled) / 1e4
+        with np.errstate(invalid="ignore"):
+            near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < _TIE_TOLERANCE
+        if near_tie.any():
+            indices = np.flatnonzero(near_tie)
+            rounded[indices] = [round(float(value), 4) for value in values[indices]]
+        # Same comparisons as the builtins, so NaN and -0.0 behave identically.
+        capped = np.where(rounded < 1.0, rounded, 1.0)
+        return np.where(capped > 0.0, capped, 0.0)
+
+    def adjust(
+        self,
+        *,
+        impact: Inputs = 0.0,
+        noise: Inputs = 0.0,
+        workload: Inputs = 0.0,
+        recovery: Inputs = 0.0,
+    ) -> None:
+        """Batched :meth:`CHIEngine.adjust`; each input is a scalar or one value per agent."""
+
+        np = self._np
+        impact, noise, workload, recovery = (
+            np.asarray(value, dtype=np.float64) for value in (impact, noise, workload, recovery)
+        )
+        self.cycle += 1
+        self.energy = self._clamp(self.energy + recovery - (workload * 0.5) - (noise * 0.2))
+        self.coherence = self._clamp(self.coherence + (impact * 0.25) - (noise * 0.35) - (workload * 0.15))
+        self.entropy = self._clamp(self.entropy + (noise * 0.45) + (workload * 0.2) - (recovery * 0.2))
+        self.fatigue = self._clamp(self.fatigue + (workload * 0.4) - (recovery * 0.3))
+        self.mode = self._derive_mode()
+
+    def restore(self) -> None:
+        self.energy = self._clamp(self.energy + 0.12)
+        self.coherence = self._clamp(self.coherence + 0.18)
+        self.entropy = self._clamp(self.entropy - 0.16)
+        self.fatigue = self._clamp(self.fatigue - 0.14)
+        self.mode = self._derive_mode()
+        self.last_alert[:] = RESTAURADO
+
+    def audit(self) -> "np.ndarray":
+        """Severity code per agent (an index into :data:`SEVERITIES`); updates ``last_alert``."""
+
+        np = self._np
+        limits = self.thresholds
+        critical = self.coherence < limits.critical_coherence
+        saturated = ~critical & ((self.entropy > limits.saturated_entropy) | (self.fatigue > limits.saturated_fatigue))
+        low_energy = ~critical & ~saturated & (self.energy < limits.low_energy)
+        self.last_alert = np.select(
+            [critical, saturated, low_energy], [COHERENCIA_BAJA, SATURACION_OPERATIVA, ENERGIA_BAJA], NO_ALERT
+        ).astype(np.int8)
+        return np.select([critical, saturated | low_energy], [CRITICO, ALERTA], OPTIMO).astype(np.int8)
+
+    def _derive_mode(self) -> "np.ndarray":
+        np = self._np
+        limits = self.thresholds
+        return np.select(
+            [
+                (self.coherence < limits.safe_mode_coherence) | (self.entropy > limits.safe_mode_entropy),
+                (self.fatigue > limits.rest_fatigue) | (self.energy < limits.rest_energy),
+                (self.coherence > limits.focus_coherence) & (self.entropy < limits.focus_entropy),
+            ],
+            [MODO_SEGURO, REPOSO, FOCO],
+            CHARLA_BARRIO,
+        ).astype(np.int8)
+
+    # ------------------------------------------------------------------
+    def state(self, index: int) -> CHIState:
+        """The state of one agent as a scalar :class:`CHIState`."""
+
+        return CHIState(
+            energy=float(self.energy[index]),
+            coherence=float(self.coherence[index]),
+            entropy=float(self.entropy[index]),
+            fatigue=float(self.fatigue[index]),
+            cycle=self.cycle,
+            mode=MODES[self.mode[index]],  # type: ignore[arg-type]
+            last_alert=ALERTS[self.last_alert[index]],
+        )
+
+    def mode_counts(self) -> dict[str, int]:
+        counts = self._np.bincount(self.mode, minlength=len(MODES))
+        return {name: int(count) for name, count in zip(MODES, counts)}
+
+
+__all__ = [
+    "ALERTS",
+    "CHIPopulation",
+    "CHIThresholds",
+    "MODES",
+    "SEVERITIES",
+]
@@ -0,0 +1,53 @@
+"""Ask the local git checkout which files changed against a base ref."""
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+
+def _git(root: Path, *args: str) -> List[str]:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=root,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    return [item for item in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if item]
+
+
+def changed_files(root: Path | str, base_ref: str) -> Optional[List[Path]]:
+    """Return files under ``root`` changed since ``base_ref`` plus untracked files.
+
+    Paths come from the git index and work tree, so no directory walk is
+    needed. Deleted files are dropped. ``None`` means git is unavailable or
+    ``root`` is not inside a checkout, and callers should scan everything.
+    A ``base_ref`` the checkout cannot resolve raises :class:`ValueError`
+    rather than silently widening the scan to every file.
+    """
+
+    root_path = Path(root)
+    if not shutil.which("git"):
+        return None
+    try:
+        _git(root_path, "rev-parse", "--is-inside-work-tree")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    try:
+        _git(root_path, "rev-parse", "--verify", "--quiet", "--end-of-options", f"{base_ref}^{{commit}}")
+    except OSError:
+        return None
+    except subprocess.CalledProcessError as exc:
+        raise ValueError(f"Unknown base ref {base_ref!r} in {root_path}") from exc
+    try:
+        modified = _git(root_path, "diff", "--name-only", "--relative", "-z", base_ref, "--")
+        untracked = _git(root_path, "ls-files", "--others", "--exclude-standard", "-z")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    files = {root_path / relative for relative in (*modified, *untracked)}
+    return sorted(path for path in files if path.is_file())
+
+
+__all__ = ["changed_files"]
@@ -0,0 +1,268 @@
+"""SQLite history of :class:`~core.selfaudit.SelfAuditor` results.
+
+Every recorded audit keeps its issues under a stable fingerprint of rule,
+repository-relative path and whitespace-normalised line text, so an issue
+keeps its identity when unrelated edits shift its line number. Two audits
+can then be diffed into new and resolved issues, and past audits queried by
+path or category without rescanning the tree.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+
+Baseline = Union[int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    root TEXT,
+    base_ref TEXT,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    audit_id INTEGER NOT NULL REFERENCES audits (id) ON DELETE CASCADE,
+    fingerprint TEXT NOT NULL,
+    category TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    path TEXT,
+    message TEXT NOT NULL,
+    location TEXT,
+    PRIMARY KEY (audit_id, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS issues_by_path ON issues (path, audit_id);
+CREATE INDEX IF NOT EXISTS issues_by_category ON issues (category, audit_id);
+CREATE INDEX IF NOT EXISTS audits_by_label ON audits (label);
+"""
+
+
+def normalise_line(text: str) -> str:
+    return " ".join(text.split())
+
+
+def issue_fingerprint(category: str, path: Optional[str], line: str = "") -> str:
+    """Identity of an issue that survives line moves and whitespace edits."""
+
+    payload = "\0".join((category, path or "", normalise_line(line)))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class AuditRecord:
+    id: int
+    created_at: str
+    root: Optional[str]
+    base_ref: Optional[str]
+    label: Optional[str]
+
+
+@dataclass(frozen=True)
+class StoredIssue:
+    audit_id: int
+    fingerprint: str
+    category: str
+    severity: str
+    path: Optional[str]
+    message: str
+    location: Optional[str]
+
+
+@dataclass(frozen=True)
+class IssueDiff:
+    baseline_id: Optional[int]
+    current_id: int
+    new: List[StoredIssue]
+    resolved: List[StoredIssue]
+
+
+class IssueStore:
+    """Append audits to a SQLite file and answer history queries.
+
+    The store may be shared between threads (audits run in executors and
+    watchers); every use of the connection is serialised by a lock.
+    """
+
+    def __init__(self, store_file: Path | str) -> None:
+        self.store_file = Path(store_file).expanduser()
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.store_file), check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    def record(
+        self,
+        issues: Iterable[object],
+        root: Optional[str] = None,
+        base_ref: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> int:
+        """Store one audit's issues and return its id.
+
+        ``issues`` are :class:`~core.selfaudit.AuditIssue` objects carrying a
+        ``fingerprint``; repeats of a fingerprint within one audit are kept once.
+        """
+
+        connection = self._connection
+        with self._lock, connection:
+            audit_id = connection.execute(
+                "INSERT INTO audits (created_at, root, base_ref, label) VALUES (?, ?, ?, ?)",
+                (datetime.utcnow().isoformat() + "Z", root, base_ref, label),
+            ).lastrowid
+            connection.executemany(
+                "INSERT OR IGNORE INTO issues "
+                "(audit_id, fingerprint, category, severity, path, message, location) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        audit_id,
+                        issue.fingerprint,
+                        issue.category,
+                        issue.severity,
+                        issue.path,
+                        issue.message,
+                        issue.location,
+                    )
+                    for issue in issues
+                ),
+            )
+        return audit_id
+
+    # ------------------------------------------------------------------
+    def audits(self, limit: Optional[int] = None) -> List[AuditRecord]:
+        """Recorded audits, newest first."""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, created_at, root, base_ref, label FROM audits ORDER BY id DESC LIMIT ?",
+                (-1 if limit is None else limit,),
+            ).fetchall()
+        return [AuditRecord(*row) for row in rows]
+
+    def resolve(self, baseline: Baseline) -> Optional[int]:
+        """Audit id for an id, ``"latest"`` or the most recent audit with that label."""
+
+        if isinstance(baseline, int):
+            query, parameters = "SELECT id FROM audits WHERE id = ?", (baseline,)
+        elif baseline == "latest":
+            query, parameters = "SELECT MAX(id) FROM audits", ()
+        else:
+            query, parameters = "SELECT MAX(id) FROM audits WHERE label = ?", (baseline,)
+        with self._lock:
+            row = self._connection.execute(query, parameters).fetchone()
+        return row[0] if row else None
+
+    def issues(
+        self,
+        audit: Baseline = "latest",
+        path: Optional[str] = None,
+        category: Optional[str] = None,
+        severity: Optional[str] = None,
+    ) -> List[StoredIssue]:
+        """Issues of one audit, optionally filtered.
+
+        ``path`` matches a file exactly or everything below a directory.
+        """
+
+        audit_id = self.resolve(audit)
+        if audit_id is None:
+            return []
+        return self._select(audit_id, path, category, severity)
+
+    def history(self, path: Optional[str] = None, category: Optional[str] = None) -> List[StoredIssue]:
+        """Issues across every audit matching ``path`` and/or ``category``, newest audit first."""
+
+        return self._select(None, path, category, None)
+
+    def _select(
+        self,
+        audit_id: Optional[int],
+        path: Optional[str],
+        category: Optional[str],
+        severity: Optional[str],
+    ) -> List[StoredIssue]:
+        clauses: List[str] = []
+        parameters: List[object] = []
+        if audit_id is not None:
+            clauses.append("audit_id = ?")
+            parameters.append(audit_id)
+        if path is not None:
+            prefix = path.rstrip("/") + "/"
+            clauses.append("(path = ? OR substr(path, 1, ?) = ?)")
+            parameters.extend((path, len(prefix), prefix))
+        if category is not None:
+            clauses.append("category = ?")
+            parameters.append(category)
+        if severity is not None:
+            clauses.append("severity = ?")
+            parameters.append(severity)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT audit_id, fingerprint, category, severity, path, message, location FROM issues "
+                f"{where}ORDER BY audit_id DESC, category, path, location",
+                parameters,
+            ).fetchall()
+        return [StoredIssue(*row) for row in rows]
+
+    # ------------------------------------------------------------------
+    def diff(self, baseline: Optional[Baseline], current: Baseline = "latest") -> IssueDiff:
+        """Issues only in ``current`` (new) and only in ``baseline`` (resolved).
+
+        An unknown or missing baseline makes every current issue new.
+        """
+
+        current_id = self.resolve(current)
+        if current_id is None:
+            raise LookupError(f"Unknown audit {current!r}")
+        baseline_id = self.resolve(baseline) if baseline is not None else None
+        return IssueDiff(
+            baseline_id=baseline_id,
+            current_id=current_id,
+            new=self._only_in(current_id, baseline_id),
+            resolved=self._only_in(baseline_id, current_id) if baseline_id is not None else [],
+        )
+
+    def _only_in(self, audit_id: int, other_id: Optional[int]) -> List[StoredIssue]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT audit_id, fingerprint, category, severity, path, message, location FROM issues AS issue "
+                "WHERE audit_id = ? AND NOT EXISTS ("
+                "SELECT 1 FROM issues WHERE audit_id = ? AND fingerprint = issue.fingerprint) "
+                "ORDER BY category, path, location",
+                (audit_id, -1 if other_id is None else other_id),
+            ).fetchall()
+        return [StoredIssue(*row) for row in rows]
+
+    # ------------------------------------------------------------------
+    def prune(self, keep: int) -> int:
+        """Delete all but the ``keep`` most recent audits; return how many were removed."""
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM audits WHERE id NOT IN (SELECT id FROM audits ORDER BY id DESC LIMIT ?)",
+                (keep,),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+__all__ = [
+    "AuditRecord",
+    "IssueDiff",
+    "IssueStore",
+    "StoredIssue",
+    "issue_fingerprint",
+    "normalise_line",
+]
@@ -0,0 +1,253 @@
+"""Load shedding driven by CHI homeostasis.
+
+:class:`ConcurrencyLimiter` is a semaphore whose width can change while it
+is in use; work runs inside :meth:`ConcurrencyLimiter.slot`, which also
+measures how long callers queue, how long tasks take and how many fail.
+:class:`AdaptiveConcurrencyController` samples those signals (plus CPU load)
+on a timer, feeds them into :meth:`~core.chi_engine.CHIEngine.adjust` and
+sets the limiter's width from the resulting mode: ``foco`` runs at full
+width, ``charla_barrio`` at three quarters, ``reposo`` at half and
+``modo_seguro`` on a single lane. Shrinking never interrupts running work;
+new acquisitions simply wait until enough slots have been released.
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+
+from .chi_engine import CHIEngine, Mode
+
+
+DEFAULT_INTERVAL = 1.0
+MODE_SHARE: Dict[str, float] = {"foco": 1.0, "charla_barrio": 0.75, "reposo": 0.5, "modo_seguro": 0.0}
+
+
+@dataclass(slots=True)
+class LoadSignals:
+    queue_depth: int = 0
+    latency: float = 0.0
+    error_rate: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclass(frozen=True)
+class LoadScales:
+    """How raw signals map onto ``adjust`` inputs.
+
+    ``queue_capacity`` waiting callers and ``latency_target`` seconds per
+    task count as full load; ``gain`` scales every input so one tick moves
+    CHI gradually rather than all the way.
+    """
+
+    queue_capacity: int = 32
+    latency_target: float = 1.0
+    gain: float = 0.25
+
+
+def cpu_load() -> float:
+    """One-minute load average per core, capped at 1.0; ``0.0`` where unavailable."""
+
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return 0.0
+    return min(1.0, load / (os.cpu_count() or 1))
+
+
+class ConcurrencyLimiter:
+    """A resizable counting semaphore that measures the work it admits."""
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self._limit = limit
+        self._active = 0
+        self._waiting = 0
+        self._condition = threading.Condition()
+        self._completed = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def set_limit(self, limit: int) -> None:
+        with self._condition:
+            self._limit = max(1, limit)
+            self._condition.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            self._waiting += 1
+            try:
+                if not self._condition.wait_for(lambda: self._active < self._limit, timeout):
+                    return False
+            finally:
+                self._waiting -= 1
+            self._active += 1
+            return True
+
+    def release(self) -> None:
+        with self._condition:
+            if self._active == 0:
+                raise RuntimeError("release() called more times than acquire()")
+            self._active -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """Run the block in one slot, recording its duration and whether it raised.
+
+        Raises :class:`TimeoutError` when no slot frees up within ``timeout``.
+        """
+
+        if not self.acquire(timeout):
+            raise TimeoutError("No concurrency slot became available")
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._condition:
+                self._completed += 1
+                self._failed += failed
+                self._busy_seconds += elapsed
+            self.release()
+
+    def drain_signals(self) -> LoadSignals:
+        """Signals since the previous call: current queue, mean latency and error rate."""
+
+        with self._condition:
+            completed, failed, busy = self._completed, self._failed, self._busy_seconds
+            self._completed = self._failed = 0
+            self._busy_seconds = 0.0
+            waiting = self._waiting
+        return LoadSignals(
+            queue_depth=waiting,
+            latency=busy / completed if completed else 0.0,
+            error_rate=failed / completed if completed else 0.0,
+        )
+
+
+class AdaptiveConcurrencyController:
+    """Turn measured load into CHI cycles and CHI modes into concurrency limits.
+
+    Each tick takes :class:`LoadSignals` from ``sample`` (by default the
+    limiter's own measurements plus :func:`cpu_load`) and applies them as
+    one :meth:`CHIEngine.adjust`:
+
+    * ``workload`` rises with queue depth and CPU,
+    * ``noise`` with the error rate and latency beyond the target,
+    * ``recovery`` with idle capacity, and
+    * ``impact`` is positive while tasks mostly succeed.
+
+    The limiter is then resized from the new mode.
+    """
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        max_concurrency: int | None = None,
+        *,
+        engine: CHIEngine | None = None,
+        sample: Callable[[], LoadSignals] | None = None,
+        scales: LoadScales | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        on_change: Callable[[Mode, int], None] | None = None,
+    ) -> None:
+        self.limiter = limiter
+        self.max_concurrency = max_concurrency or limiter.limit
+        self.engine = engine or CHIEngine()
+        self.sample = sample or self._default_sample
+        self.scales = scales or LoadScales()
+        self.interval = interval
+        self.on_change = on_change
+        self.last_signals = LoadSignals()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.limiter.set_limit(self.limit_for(self.engine.state.mode))
+
+    def _default_sample(self) -> LoadSignals:
+        signals = self.limiter.drain_signals()
+        signals.cpu = cpu_load()
+        return signals
+
+    def limit_for(self, mode: Mode) -> int:
+        return max(1, math.ceil(self.max_concurrency * MODE_SHARE[mode]))
+
+    # ------------------------------------------------------------------
+    def start(self) -> "AdaptiveConcurrencyController":
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kai-load-control", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "AdaptiveConcurrencyController":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.tick()
+
+    # ------------------------------------------------------------------
+    def tick(self, signals: LoadSignals | None = None) -> int:
+        """Apply one sample (taken now unless given) and return the new limit."""
+
+        signals = signals or self.sample()
+        self.last_signals = signals
+        scales = self.scales
+        queue = min(1.0, signals.queue_depth / scales.queue_capacity) if scales.queue_capacity else 0.0
+        cpu = min(1.0, max(0.0, signals.cpu))
+        errors = min(1.0, max(0.0, signals.error_rate))
+        slow = min(1.0, max(0.0, signals.latency / scales.latency_target - 1.0)) if scales.latency_target else 0.0
+        workload = max(queue, cpu)
+        previous = self.engine.state.mode
+        state = self.engine.adjust(
+            impact=scales.gain * (0.5 - errors),
+            noise=scales.gain * min(1.0, errors + slow),
+            workload=scales.gain * workload,
+            recovery=scales.gain * (1.0 - workload) * (1.0 - errors),
+        )
+        limit = self.limit_for(state.mode)
+        if limit != self.limiter.limit:
+            self.limiter.set_limit(limit)
+        if state.mode != previous and self.on_change is not None:
+            self.on_change(state.mode, limit)
+        return limit
+
+
+__all__ = [
+    "AdaptiveConcurrencyController",
+    "ConcurrencyLimiter",
+    "LoadScales",
+    "LoadSignals",
+    "MODE_SHARE",
+    "cpu_load",
+]
@@ -0,0 +1,159 @@
+"""Compact match records for :class:`~core.scanner.RepositoryScanner`.
+
+A scan keeps only line numbers and byte offsets per file, in ``array``
+storage, with paths interned once per scan. The ``"lineno: line"`` text the
+scanner used to build eagerly is read from disk only when a caller asks for
+it, so large audits no longer hold millions of small strings.
+"""
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, overload
+
+from .archives import read_member, split_member
+
+LINENO_TYPECODE = "I"
+OFFSET_TYPECODE = "Q"
+
+Positions = Tuple[array, array]
+
+
+def new_positions() -> Positions:
+    return array(LINENO_TYPECODE), array(OFFSET_TYPECODE)
+
+
+def read_lines(path: Path, offsets: Iterable[int]) -> List[str]:
+    """Return the right-stripped text of the lines starting at ``offsets``.
+
+    Archive member paths (``archive.zip!/inner``) are read from the archive.
+    """
+
+    lines: List[str] = []
+    if split_member(path) is not None:
+        data = read_member(path) or b""
+        for offset in offsets:
+            end = data.find(b"\n", offset)
+            lines.append(data[offset:end if end >= 0 else len(data)].decode("utf-8", errors="ignore").rstrip())
+        return lines
+    with path.open("rb") as handle:
+        for offset in offsets:
+            handle.seek(offset)
+            lines.append(handle.readline().decode("utf-8", errors="ignore").rstrip())
+    return lines
+
+
+class PathTable:
+    """Intern paths so every match in a scan refers to a small integer."""
+
+    __slots__ = ("_ids", "paths")
+
+    def __init__(self) -> None:
+        self._ids: Dict[Path, int] = {}
+        self.paths: List[Path] = []
+
+    def intern(self, path: Path) -> int:
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = self._ids[path] = len(self.paths)
+            self.paths.append(path)
+        return path_id
+
+    def __getitem__(self, path_id: int) -> Path:
+        return self.paths[path_id]
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+class LineMatch:
+    """A single hit whose line text is loaded on first access."""
+
+    __slots__ = ("path", "lineno", "offset", "_text")
+
+    def __init__(self, path: Path, lineno: int, offset: int) -> None:
+        self.path = path
+        self.lineno = lineno
+        self.offset = offset
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = read_lines(self.path, (self.offset,))[0]
+        return self._text
+
+    @staticmethod
+    def preload(matches: Sequence["LineMatch"]) -> None:
+        """Fill in text for matches that share one file with a single open."""
+
+        pending = [match for match in matches if match._text is None]
+        if pending:
+            for match, text in zip(pending, read_lines(pending[0].path, (match.offset for match in pending))):
+                match._text = text
+
+    def __str__(self) -> str:
+        return f"{self.lineno}: {self.text}"
+
+    def __repr__(self) -> str:
+        return f"LineMatch({str(self.path)!r}, lineno={self.lineno}, offset={self.offset})"
+
+
+class FileMatches(Sequence[str]):
+    """Hits for one rule in one file, behaving like a list of ``"lineno: line"``."""
+
+    __slots__ = ("_table", "path_id", "linenos", "offsets")
+
+    def __init__(self, table: PathTable, path_id: int, linenos: array, offsets: array) -> None:
+        self._table = table
+        self.path_id = path_id
+        self.linenos = linenos
+        self.offsets = offsets
+
+    @property
+    def path(self) -> Path:
+        return self._table[self.path_id]
+
+    def records(self) -> Iterator[LineMatch]:
+        path = self.path
+        for lineno, offset in zip(self.linenos, self.offsets):
+            yield LineMatch(path, lineno, offset)
+
+    def __len__(self) -> int:
+        return len(self.linenos)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | List[str]:
+        if isinstance(index, slice):
+            linenos = self.linenos[index]
+            return [f"{lineno}: {text}" for lineno, text in zip(linenos, read_lines(self.path, self.offsets[index]))]
+        lineno, offset = self.linenos[index], self.offsets[index]
+        return f"{lineno}: {read_lines(self.path, (offset,))[0]}"
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self[:])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FileMatches):
+            return self.path == other.path and self.linenos == other.linenos and self.offsets == other.offsets
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FileMatches({str(self.path)!r}, linenos={self.linenos.tolist()})"
+
+
+__all__ = [
+    "FileMatches",
+    "LineMatch",
+    "PathTable",
+    "Positions",
+    "new_positions",
+    "read_lines",
+]
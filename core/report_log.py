@@ -0,0 +1,348 @@
+"""Append-only JSON Lines log of :class:`~core.absorb_and_audit.AbsorptionReport` runs.
+
+Reports are appended one JSON object per line to numbered segment files
+(``reports-000001.jsonl``, ...). When the active segment would grow past
+``max_segment_bytes`` a new one is started, and with ``max_segments`` the
+oldest segments are dropped. A sidecar SQLite index stores the segment,
+byte offset and length of every record together with its timestamp,
+approval and CHI severity, so range and filter queries seek straight to the
+matching lines instead of parsing the whole log.
+
+The log is the source of truth: records appended without reaching the index
+(for example after a crash) are indexed again on open, and
+:meth:`ReportLog.rebuild_index` recreates the index from the segments.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+INDEX_FILE_NAME = "index.sqlite"
+COMPACTION_FILE_NAME = "compaction.json"
+SEGMENT_TEMPLATE = "reports-{:06d}.jsonl"
+_SEGMENT_NAME = re.compile(r"^reports-(\d{6,})\.jsonl$")
+_PENDING_SUFFIX = ".compact"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    generated_at TEXT NOT NULL,
+    approved INTEGER NOT NULL,
+    severity TEXT NOT NULL,
+    UNIQUE (segment, offset)
+);
+CREATE INDEX IF NOT EXISTS records_by_time ON records (generated_at);
+CREATE INDEX IF NOT EXISTS records_by_filter ON records (approved, severity, generated_at);
+"""
+
+
+def _index_fields(record: Mapping[str, object]) -> Tuple[str, int, str]:
+    return (
+        str(record.get("generated_at", "")),
+        1 if record.get("approved") else 0,
+        str(record.get("chi_severity", "")),
+    )
+
+
+def _filters(
+    since: Optional[str],
+    until: Optional[str],
+    approved: Optional[bool],
+    severity: Optional[str],
+) -> Tuple[str, List[object]]:
+    clauses: List[str] = []
+    parameters: List[object] = []
+    if since is not None:
+        clauses.append("generated_at >= ?")
+        parameters.append(since)
+    if until is not None:
+        clauses.append("generated_at < ?")
+        parameters.append(until)
+    if approved is not None:
+        clauses.append("approved = ?")
+        parameters.append(1 if approved else 0)
+    if severity is not None:
+        clauses.append("severity = ?")
+        parameters.append(severity)
+    return (f"WHERE {' AND '.join(clauses)} " if clauses else ""), parameters
+
+
+class ReportLog:
+    """Segmented JSON Lines report log with a queryable sidecar index."""
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        max_segments: Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self._connection = sqlite3.connect(str(self.directory / INDEX_FILE_NAME))
+        self._connection.executescript(_SCHEMA)
+        self._recover()
+
+    # ------------------------------------------------------------------
+    def segments(self) -> List[int]:
+        numbers = []
+        for entry in os.scandir(self.directory):
+            match = _SEGMENT_NAME.match(entry.name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def segment_path(self, segment: int) -> Path:
+        return self.directory / SEGMENT_TEMPLATE.format(segment)
+
+    # ------------------------------------------------------------------
+    def append(self, report: object) -> Path:
+        """Append a report (dataclass or mapping) and return the segment written."""
+
+        record = asdict(report) if is_dataclass(report) else dict(report)  # type: ignore[arg-type]
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        segments = self.segments()
+        segment = segments[-1] if segments else 1
+        path = self.segment_path(segment)
+        size = path.stat().st_size if path.exists() else 0
+        if size and size + len(line) > self.max_segment_bytes:
+            segment += 1
+            path = self.segment_path(segment)
+            size = 0
+        with open(path, "ab") as handle:
+            offset = handle.tell()
+            handle.write(line)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO records (segment, offset, length, generated_at, approved, severity) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (segment, offset, len(line), *_index_fields(record)),
+            )
+        if self.max_segments is not None:
+            self._drop_oldest(self.max_segments)
+        return path
+
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        approved: Optional[bool] = None,
+        severity: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, object]]:
+        """Yield matching records as dicts, in append order unless ``newest_first``.
+
+        ``since`` is inclusive and ``until`` exclusive; both compare against
+        the ISO ``generated_at`` strings the reports carry.
+        """
+
+        where, parameters = _filters(since, until, approved, severity)
+        direction = "DESC" if newest_first else "ASC"
+        rows = self._connection.execute(
+            f"SELECT segment, offset, length FROM records {where}"
+            f"ORDER BY segment {direction}, offset {direction} LIMIT ?",
+            (*parameters, -1 if limit is None else limit),
+        ).fetchall()
+        yield from self._read(rows)
+
+    def count(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        approved: Optional[bool] = None,
+        severity: Optional[str] = None,
+    ) -> int:
+        """Number of matching records, answered from the index alone."""
+
+        where, parameters = _filters(since, until, approved, severity)
+        return self._connection.execute(f"SELECT COUNT(*) FROM records {where}", parameters).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def _read(self, rows: List[Tuple[int, int, int]]) -> Iterator[Dict[str, object]]:
+        handles: Dict[int, object] = {}
+        try:
+            for segment, offset, length in rows:
+                handle = handles.get(segment)
+                if handle is None:
+                    try:
+                        handle = handles[segment] = open(self.segment_path(segment), "rb")
+                    except FileNotFoundError:
+                        continue
+                handle.seek(offset)  # type: ignore[attr-defined]
+                yield json.loads(handle.read(length))  # type: ignore[attr-defined]
+        finally:
+            for handle in handles.values():
+                handle.close()  # type: ignore[attr-defined]
+
+    # ------------------------------------------------------------------
+    def compact(self, keep: Optional[Callable[[Dict[str, object]], bool]] = None) -> int:
+        """Rewrite the log into densely packed segments, dropping records ``keep`` rejects.
+
+        New segments are written under temporary names next to the old ones.
+        Once they are complete a :data:`COMPACTION_FILE_NAME` marker records
+        the swap, which is then carried out: new segments renamed into place,
+        old ones removed, index replaced. If that is interrupted, the next
+        open finishes the swap from the marker; if the rewrite itself is
+        interrupted, the next open discards the partial segments. Either way
+        no record ends up in the log twice. Returns the number of records
+        removed.
+        """
+
+        old_segments = self.segments()
+        first = (old_segments[-1] + 1) if old_segments else 1
+        segment, size, written, dropped = first, 0, [], 0
+        entries: List[Tuple[int, int, int, str, int, str]] = []
+        output = None
+        try:
+            for number in old_segments:
+                with open(self.segment_path(number), "rb") as handle:
+                    for line in handle:
+                        if not line.endswith(b"\n"):
+                            continue
+                        record = json.loads(line)
+                        if keep is not None and not keep(record):
+                            dropped += 1
+                            continue
+                        if output is None or (size and size + len(line) > self.max_segment_bytes):
+                            if output is not None:
+                                output.close()
+                                segment += 1
+                            output = open(self._pending_path(segment), "wb")
+                            written.append(segment)
+                            size = 0
+                        entries.append((segment, size, len(line), *_index_fields(record)))
+                        output.write(line)
+                        size += len(line)
+        except BaseException:
+            if output is not None:
+                output.close()
+            for number in written:
+                self._pending_path(number).unlink(missing_ok=True)
+            raise
+        if output is not None:
+            output.close()
+        marker = self.directory / COMPACTION_FILE_NAME
+        staging = marker.with_name(marker.name + ".tmp")
+        staging.write_text(json.dumps({"old": old_segments, "new": written}), encoding="utf-8")
+        os.replace(staging, marker)
+        self._swap_segments(old_segments, written)
+        with self._connection:
+            self._connection.execute("DELETE FROM records")
+            self._connection.executemany(
+                "INSERT INTO records (segment, offset, length, generated_at, approved, severity) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                entries,
+            )
+        marker.unlink()
+        return dropped
+
+    def _pending_path(self, segment: int) -> Path:
+        return self.directory / (SEGMENT_TEMPLATE.format(segment) + _PENDING_SUFFIX)
+
+    def _swap_segments(self, old: List[int], new: List[int]) -> None:
+        """Put compacted segments in place of the old ones; safe to repeat after a crash."""
+
+        for number in new:
+            pending = self._pending_path(number)
+            if pending.exists():
+                os.replace(pending, self.segment_path(number))
+        for number in old:
+            self.segment_path(number).unlink(missing_ok=True)
+
+    def _finish_compaction(self) -> None:
+        """Complete a compaction whose marker was written, or discard one that never got there."""
+
+        marker = self.directory / COMPACTION_FILE_NAME
+        if marker.exists():
+            plan = json.loads(marker.read_text(encoding="utf-8"))
+            self._swap_segments(plan["old"], plan["new"])
+            # Old segments are gone, so the index rows still pointing at them
+            # are dropped and the new segments are indexed by ``_recover``.
+            marker.unlink()
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_PENDING_SUFFIX) or entry.name == COMPACTION_FILE_NAME + ".tmp":
+                os.unlink(entry.path)
+
+    def rotate(self) -> Path:
+        """Start a new segment now; later appends go there."""
+
+        segments = self.segments()
+        path = self.segment_path((segments[-1] + 1) if segments else 1)
+        path.touch()
+        if self.max_segments is not None:
+            self._drop_oldest(self.max_segments)
+        return path
+
+    def _drop_oldest(self, keep: int) -> None:
+        segments = self.segments()
+        expired = segments[:-keep] if keep > 0 else segments
+        if not expired:
+            return
+        with self._connection:
+            self._connection.executemany("DELETE FROM records WHERE segment = ?", ((number,) for number in expired))
+        for number in expired:
+            self.segment_path(number).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    def rebuild_index(self) -> None:
+        with self._connection:
+            self._connection.execute("DELETE FROM records")
+        self._recover()
+
+    def _recover(self) -> None:
+        """Index complete lines beyond each segment's last indexed record."""
+
+        self._finish_compaction()
+        connection = self._connection
+        segments = self.segments()
+        with connection:
+            connection.execute(
+                f"DELETE FROM records WHERE segment NOT IN ({','.join('?' * len(segments))})", segments
+            )
+            for number in segments:
+                end = connection.execute(
+                    "SELECT MAX(offset + length) FROM records WHERE segment = ?", (number,)
+                ).fetchone()[0] or 0
+                path = self.segment_path(number)
+                if path.stat().st_size <= end:
+                    continue
+                with open(path, "r+b") as handle:
+                    handle.seek(end)
+                    offset = end
+                    for line in handle:
+                        if not line.endswith(b"\n"):
+                            # A torn final write; drop it so appends stay line aligned.
+                            handle.truncate(offset)
+                            break
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            offset += len(line)
+                            continue
+                        connection.execute(
+                            "INSERT OR REPLACE INTO records (segment, offset, length, generated_at, approved, severity) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (number, offset, len(line), *_index_fields(record)),
+                        )
+                        offset += len(line)
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+__all__ = ["ReportLog"]
@@ -0,0 +1,138 @@
+"""Persistent, metadata-keyed cache for :class:`~core.scanner.RepositoryScanner`.
+
+Each scanned file is remembered by path together with its size, ``mtime_ns``
+and inode.  As long as that key is unchanged the cached line count and rule
+hits are reused, so repeated audits only re-read files that actually changed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .matches import LINENO_TYPECODE, OFFSET_TYPECODE, Positions
+
+
+CACHE_FORMAT_VERSION = 3
+MAX_RULESETS_PER_FILE = 4
+# Files modified this recently may change again within the same mtime tick
+# without the key noticing, so they are scanned but never cached.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ScanCache:
+    """On-disk cache of per-file line counts and rule hits."""
+
+    def __init__(self, cache_file: Path | str) -> None:
+        self.cache_file = Path(cache_file).expanduser()
+        self.stats = CacheStats()
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+        if self.cache_file.exists():
+            try:
+                data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == CACHE_FORMAT_VERSION:
+                self._entries = data.get("files", {})
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _key(stat: os.stat_result) -> List[int]:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def _entry(self, path: Path, stat: os.stat_result) -> Optional[Dict[str, object]]:
+        entry = self._entries.get(str(path))
+        if entry is None:
+            return None
+        if entry.get("key") != self._key(stat):
+            del self._entries[str(path)]
+            self._dirty = True
+            return None
+        return entry
+
+    def _writable_entry(self, path: Path, stat: os.stat_result) -> Optional[Dict[str, object]]:
+        if time.time_ns() - stat.st_mtime_ns < _RACY_WINDOW_NS:
+            return None
+        entry = self._entry(path, stat)
+        if entry is None:
+            entry = {"key": self._key(stat), "lines": None, "rules": {}}
+            self._entries[str(path)] = entry
+        self._dirty = True
+        return entry
+
+    # ------------------------------------------------------------------
+    def get_line_count(self, path: Path, stat: os.stat_result) -> Optional[int]:
+        entry = self._entry(path, stat)
+        lines = entry.get("lines") if entry else None
+        if lines is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return int(lines)
+
+    def set_line_count(self, path: Path, stat: os.stat_result, lines: int) -> None:
+        entry = self._writable_entry(path, stat)
+        if entry is not None:
+            entry["lines"] = lines
+
+    def get_hits(self, path: Path, stat: os.stat_result, fingerprint: str) -> Optional[Dict[str, Positions]]:
+        """Return cached hit positions for the rule set identified by ``fingerprint``."""
+
+        entry = self._entry(path, stat)
+        hits = entry["rules"].get(fingerprint) if entry else None
+        if hits is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return {
+            name: (array(LINENO_TYPECODE, linenos), array(OFFSET_TYPECODE, offsets))
+            for name, (linenos, offsets) in hits.items()
+        }
+
+    def set_hits(self, path: Path, stat: os.stat_result, fingerprint: str, hits: Dict[str, Positions]) -> None:
+        entry = self._writable_entry(path, stat)
+        if entry is None:
+            return
+        rules: Dict[str, object] = entry["rules"]
+        rules.pop(fingerprint, None)
+        rules[fingerprint] = {name: [linenos.tolist(), offsets.tolist()] for name, (linenos, offsets) in hits.items()}
+        # A changed rule set gets a new fingerprint; old ones age out here.
+        while len(rules) > MAX_RULESETS_PER_FILE:
+            del rules[next(iter(rules))]
+
+    # ------------------------------------------------------------------
+    def save(self) -> None:
+        """Persist the cache atomically if anything changed."""
+
+        if not self._dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": CACHE_FORMAT_VERSION, "files": self._entries}
+        temporary = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        temporary.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(temporary, self.cache_file)
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats = CacheStats()
+        self._dirty = True
+
+
+__all__ = ["CacheStats", "ScanCache"]
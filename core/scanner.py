@@ -1,17 +1,56 @@
 """Static scanning helpers for Kai's autonomous diagnostics."""
 from __future__ import annotations
 
-import fnmatch
+import hashlib
+import heapq
 import json
+import mmap
+import os
 import re
+import threading
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Pattern, Sequence, Set, Tuple, TypeVar, Union
+
+from .archives import ARCHIVE_PATTERNS, ArchiveLimits, expand_archives, member_size, read_member, split_member
+from .git_changes import changed_files
+from .matches import FileMatches, LineMatch, PathTable, Positions, new_positions
+from .scan_cache import ScanCache
+from .trigram_index import TrigramIndex
+from .walker import FileMatcher, walk_files
 
 
 EXCLUDED_DIRECTORIES = {".git", "node_modules", "dist", "build", "__pycache__"}
 DEFAULT_FILE_PATTERNS = ("*.ts", "*.tsx", "*.js", "*.jsx", "*.py", "*.md")
+HIGH_RISK_PATTERNS: Dict[str, str] = {
+    "dangerous_eval": r"\beval\s*\(",
+    "hardcoded_secret": r"(?i)(api_key|secret|password)\s*[=:]",
+    "broad_exception": r"except\s+Exception",
+}
+
+_LEADING_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+_NUMERIC_BACKREF = re.compile(r"\\[1-9]")
+_SCOPED_FLAGS = ((re.ASCII, "a"), (re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+_NEWLINE = re.compile(b"\n")
+# Escapes whose meaning differs between str (Unicode) and bytes (ASCII) patterns.
+_UNICODE_CLASS = re.compile(r"\\[wWbBsSdD]")
+# Bytes where those escapes, or IGNORECASE, can disagree: str ``\s`` also
+# matches \x1c-\x1f, and everything above ASCII.
+_UNICODE_SENSITIVE_BYTES = re.compile(b"[\x1c-\x1f\x80-\xff]")
+_END_ANCHOR = re.compile(r"\$|\\Z")
+BATCHES_PER_WORKER = 4
+MIN_FILES_PER_WORKER = 8
+DEFAULT_MAX_FILE_SIZE = 32 * 1024 * 1024
+DEFAULT_MMAP_THRESHOLD = 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+READ_CHUNK_SIZE = 1024 * 1024
+
+_T = TypeVar("_T")
+Buffer = Union[bytes, mmap.mmap]
 
 
 @dataclass
@@ -21,74 +60,826 @@ class RepositoryStats:
     extensions: Dict[str, int]
 
 
+@dataclass(frozen=True)
+class ScanLimits:
+    """How files are read: size cap, mmap cut-over and binary sniffing."""
+
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE
+    mmap_threshold: int = DEFAULT_MMAP_THRESHOLD
+    binary_sniff_bytes: int = BINARY_SNIFF_BYTES
+
+    def allows(self, size: int) -> bool:
+        return self.max_file_size is None or size <= self.max_file_size
+
+
+class RuleSet:
+    """Named regex rules evaluated together in a single pass over a file.
+
+    The rules are folded into one alternation so files without any hit are
+    rejected by a single ``search`` over their whole content; only lines the
+    combined expression accepts are checked against each individual rule.
+
+    ASCII-only rule sets are also compiled to ``bytes`` so raw file buffers
+    can be searched without decoding. Buffers where the bytes patterns could
+    disagree with the text ones still go through decoded text: non-ASCII
+    content when a rule uses ``\\w``/``\\s``/``\\b``-style classes or
+    IGNORECASE, and ``\\r\\n`` line endings when a rule anchors on ``$``.
+    Other rule sets always use decoded text.
+    """
+
+    def __init__(self, rules: Mapping[str, str | Pattern[str]]) -> None:
+        self.rules: Dict[str, Pattern[str]] = {
+            name: re.compile(regex) if isinstance(regex, str) else regex for name, regex in rules.items()
+        }
+        self.combined = self._combine(self.rules.values())
+        self.byte_rules: Optional[Dict[str, Pattern[bytes]]] = None
+        self.byte_combined: Optional[Pattern[bytes]] = None
+        self._unicode_sensitive = any(
+            _UNICODE_CLASS.search(regex.pattern) or (regex.flags & re.IGNORECASE and not regex.flags & re.ASCII)
+            for regex in self.rules.values()
+        )
+        self._end_anchored = any(_END_ANCHOR.search(regex.pattern) for regex in self.rules.values())
+        if self.combined is not None:
+            try:
+                self.byte_rules = {
+                    name: re.compile(regex.pattern.encode("ascii"), regex.flags & ~re.UNICODE)
+                    for name, regex in self.rules.items()
+                }
+                self.byte_combined = re.compile(self.combined.pattern.encode("ascii"), re.MULTILINE)
+            except (UnicodeEncodeError, re.error):
+                self.byte_rules = None
+        # Bumped when matching semantics change so cached hits are recomputed.
+        digest = hashlib.sha1(b"ruleset-v2\0")
+        for name, regex in self.rules.items():
+            digest.update(f"{name}\0{regex.pattern}\0{regex.flags}\0".encode("utf-8", "surrogatepass"))
+        self.fingerprint = digest.hexdigest()
+
+    @staticmethod
+    def _combine(patterns: Iterable[Pattern[str]]) -> Optional[Pattern[str]]:
+        alternatives: List[str] = []
+        for index, regex in enumerate(patterns):
+            body = regex.pattern
+            if not isinstance(body, str) or _NUMERIC_BACKREF.search(body):
+                return None
+            while _LEADING_FLAGS.match(body):
+                body = _LEADING_FLAGS.sub("", body, count=1)
+            letters = "".join(letter for flag, letter in _SCOPED_FLAGS if regex.flags & flag)
+            scoped = f"(?{letters}:{body})" if letters else f"(?:{body})"
+            alternatives.append(f"(?P<_rule{index}>{scoped})")
+        if not alternatives:
+            return None
+        try:
+            # MULTILINE keeps ``^``/``$`` anchored per line when the whole file is searched at once.
+            return re.compile("|".join(alternatives), re.MULTILINE)
+        except re.error:
+            return None
+
+    def scan_text(self, text: str) -> Dict[str, List[str]]:
+        """Return ``lineno: line`` hits per rule name for ``text``."""
+
+        hits: Dict[str, List[str]] = {}
+        for name, lineno, line in self.iter_text(text):
+            hits.setdefault(name, []).append(f"{lineno}: {line.rstrip()}")
+        return hits
+
+    def scan_buffer(self, buffer: Buffer) -> Dict[str, List[str]]:
+        """Like :meth:`scan_text` for raw bytes, numbering only matching lines."""
+
+        hits: Dict[str, List[str]] = {}
+        for name, lineno, offset in self.iter_positions(buffer):
+            end = buffer.find(b"\n", offset)
+            line = buffer[offset:end if end != -1 else len(buffer)]
+            hits.setdefault(name, []).append(f"{lineno}: {line.decode('utf-8', errors='ignore').rstrip()}")
+        return hits
+
+    def scan_positions(self, buffer: Buffer, limit: Optional[int] = None) -> Dict[str, Positions]:
+        """Return compact ``(linenos, offsets)`` arrays per rule for ``buffer``."""
+
+        hits: Dict[str, Positions] = {}
+        for name, lineno, offset in self.iter_positions(buffer, limit):
+            linenos, offsets = hits.get(name) or hits.setdefault(name, new_positions())
+            linenos.append(lineno)
+            offsets.append(offset)
+        return hits
+
+    def iter_text(self, text: str, limit: Optional[int] = None) -> Iterator[Tuple[str, int, str]]:
+        """Yield ``(rule, lineno, line)`` in line order, at most ``limit`` per rule."""
+
+        combined = self.combined
+        if combined is not None and not combined.search(text):
+            return
+        counts: Dict[str, int] = {}
+        lines = text.split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        for lineno, line in enumerate(lines, start=1):
+            if combined is not None and not combined.search(line):
+                continue
+            for name, regex in self.rules.items():
+                if counts.get(name, 0) != limit and regex.search(line):
+                    counts[name] = counts.get(name, 0) + 1
+                    yield name, lineno, line
+            if limit is not None and len(counts) == len(self.rules) and all(value >= limit for value in counts.values()):
+                return
+
+    def iter_positions(self, buffer: Buffer, limit: Optional[int] = None) -> Iterator[Tuple[str, int, int]]:
+        """Yield ``(rule, lineno, line_offset)`` for raw bytes in line order.
+
+        Line numbers are only worked out for lines that match.
+        """
+
+        if self.byte_rules is None or self.byte_combined is None or self._needs_text(buffer):
+            text = bytes(buffer).decode("utf-8", errors="ignore")
+            lineno, offset = 1, 0
+            for name, target, _line in self.iter_text(text.replace("\r\n", "\n").replace("\r", "\n"), limit):
+                while lineno < target:
+                    following = buffer.find(b"\n", offset)
+                    if following == -1:
+                        break
+                    offset = following + 1
+                    lineno += 1
+                yield name, target, offset
+            return
+        combined = self.byte_combined
+        counts: Dict[str, int] = {}
+        size = len(buffer)
+        position, lineno, counted = 0, 1, 0
+        while position < size:
+            match = combined.search(buffer, position)
+            if match is None:
+                break
+            # Re-check from the start of the line holding the match so a hit
+            # spanning a newline never hides one on the following line.
+            start = buffer.rfind(b"\n", position, match.start()) + 1 or position
+            if start >= size:
+                break
+            end = buffer.find(b"\n", match.start())
+            if end == -1:
+                end = size
+            lineno += _count_newlines(buffer, counted, start)
+            counted = start
+            line = buffer[start:end]
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            for name, regex in self.byte_rules.items():
+                if counts.get(name, 0) != limit and regex.search(line):
+                    counts[name] = counts.get(name, 0) + 1
+                    yield name, lineno, start
+            if limit is not None and len(counts) == len(self.rules) and all(value >= limit for value in counts.values()):
+                return
+            position = end + 1
+
+
+    def _needs_text(self, buffer: Buffer) -> bool:
+        """Whether ``buffer`` could match the bytes patterns differently from the text ones."""
+
+        if self._end_anchored and buffer.find(b"\r") != -1:
+            return True
+        return self._unicode_sensitive and _UNICODE_SENSITIVE_BYTES.search(buffer) is not None
+
+
+def _ordered_positions(ruleset: RuleSet, hits: Mapping[str, Positions], limit: Optional[int]) -> List[Tuple[str, int, int]]:
+    """Flatten cached per-rule positions back into line order."""
+
+    order = {name: index for index, name in enumerate(ruleset.rules)}
+    flat = [
+        (name, lineno, offset)
+        for name, (linenos, offsets) in hits.items()
+        for lineno, offset in zip(linenos[:limit], offsets[:limit])
+    ]
+    flat.sort(key=lambda item: (item[1], order.get(item[0], 0)))
+    return flat
+
+
+def _count_newlines(buffer: Buffer, start: int, end: int) -> int:
+    if isinstance(buffer, bytes):
+        return buffer.count(b"\n", start, end)
+    return len(_NEWLINE.findall(buffer, start, end))
+
+
+@dataclass
+class ScanCounters:
+    """I/O done by a scanner: files yielded by walks, files opened and bytes read."""
+
+    files_walked: int = 0
+    files_read: int = 0
+    bytes_read: int = 0
+
+    def copy(self) -> "ScanCounters":
+        return ScanCounters(self.files_walked, self.files_read, self.bytes_read)
+
+    def since(self, earlier: "ScanCounters") -> "ScanCounters":
+        return ScanCounters(
+            self.files_walked - earlier.files_walked,
+            self.files_read - earlier.files_read,
+            self.bytes_read - earlier.bytes_read,
+        )
+
+
+# Reads done by each thread of this process; scanners attribute the growth
+# during their calls to themselves, and worker processes report theirs with
+# each batch. Per-thread counters keep concurrent scans (``arun``, watchers)
+# from seeing each other's reads and need no lock.
+_THREAD_READS = threading.local()
+
+
+def _reads() -> ScanCounters:
+    counters = getattr(_THREAD_READS, "counters", None)
+    if counters is None:
+        counters = _THREAD_READS.counters = ScanCounters()
+    return counters
+
+
+def _count_read(size: int) -> None:
+    counters = _reads()
+    counters.files_read += 1
+    counters.bytes_read += size
+
+
+def _sniff(handle: BinaryIO, limits: ScanLimits) -> Optional[bytes]:
+    """Return the file head, or ``None`` if the file is too big or binary."""
+
+    if not limits.allows(os.fstat(handle.fileno()).st_size):
+        return None
+    head = handle.read(limits.binary_sniff_bytes)
+    return None if b"\0" in head else head
+
+
+@contextmanager
+def _open_buffer(path: Path, limits: ScanLimits) -> Iterator[Optional[Buffer]]:
+    """Yield file contents as bytes, or memory-mapped above the threshold.
+
+    Archive members are decompressed into memory under the same size limit.
+    """
+
+    if split_member(path) is not None:
+        data = read_member(path, limits.max_file_size)
+        if data is not None:
+            _count_read(len(data))
+        yield None if data is None or b"\0" in data[:limits.binary_sniff_bytes] else data
+        return
+    with path.open("rb") as handle:
+        head = _sniff(handle, limits)
+        if head is None:
+            yield None
+            return
+        size = os.fstat(handle.fileno()).st_size
+        _count_read(size)
+        if not size or size < limits.mmap_threshold:
+            yield head + handle.read()
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _count_lines(limits: ScanLimits, path: Path) -> int:
+    if split_member(path) is not None:
+        with _open_buffer(path, limits) as data:
+            return _count_newlines(data, 0, len(data)) if data else 0
+    with path.open("rb") as handle:
+        chunk = _sniff(handle, limits)
+        if chunk is None:
+            return 0
+        count, last, size = 0, b"", 0
+        while chunk:
+            count += chunk.count(b"\n")
+            size += len(chunk)
+            last = chunk[-1:]
+            chunk = handle.read(READ_CHUNK_SIZE)
+        _count_read(size)
+        return count + (1 if last and last != b"\n" else 0)
+
+
+def _read_for_index(limits: ScanLimits, path: Path) -> Optional[bytes]:
+    with path.open("rb") as handle:
+        head = _sniff(handle, limits)
+        if head is None:
+            return None
+        data = head + handle.read()
+        _count_read(len(data))
+        return data
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    """``stat`` for files on disk; archive members have none and bypass the cache."""
+
+    return None if split_member(path) is not None else path.stat()
+
+
+def _content_digest(buffer: Buffer) -> bytes:
+    return hashlib.blake2b(buffer, digest_size=16).digest()
+
+
+class _ScanTask:
+    """Scan files for one rule set, evaluating each distinct blob only once.
+
+    Identical files (vendored copies, duplicated components) share the
+    positions computed for the first one. The memo lives for one scan call,
+    or for one batch when running in a worker process. ``limit`` caps the
+    hits kept per rule and file.
+    """
+
+    def __init__(self, ruleset: RuleSet, limits: ScanLimits, dedupe: bool = True, limit: Optional[int] = None) -> None:
+        self.ruleset = ruleset
+        self.limits = limits
+        self.dedupe = dedupe
+        self.limit = limit
+        self.memo: Dict[bytes, Dict[str, Positions]] = {}
+
+    def __call__(self, path: Path) -> Dict[str, Positions]:
+        with _open_buffer(path, self.limits) as buffer:
+            if buffer is None:
+                return {}
+            if not self.dedupe:
+                return self.ruleset.scan_positions(buffer, self.limit)
+            digest = _content_digest(buffer)
+            hits = self.memo.get(digest)
+            if hits is None:
+                hits = self.memo[digest] = self.ruleset.scan_positions(buffer, self.limit)
+            return hits
+
+
+class _ContentTask:
+    """Call ``task`` with a file's contents, or ``None`` if it is binary or too big."""
+
+    def __init__(self, task: Callable[[Optional[bytes]], _T], limits: ScanLimits) -> None:
+        self.task = task
+        self.limits = limits
+
+    def __call__(self, path: Path) -> _T:
+        with _open_buffer(path, self.limits) as buffer:
+            return self.task(None if buffer is None else bytes(buffer))
+
+
+def _run_batch(task: Callable[[Path], _T], paths: Sequence[Path]) -> List[_T]:
+    return [task(path) for path in paths]
+
+
+def _run_counted_batch(task: Callable[[Path], _T], paths: Sequence[Path]) -> Tuple[List[_T], int, int]:
+    reads = _reads()
+    before = reads.copy()
+    results = _run_batch(task, paths)
+    delta = reads.since(before)
+    return results, delta.files_read, delta.bytes_read
+
+
+def _balanced_batches(sizes: Sequence[int], batch_count: int) -> List[List[int]]:
+    """Split indices into ``batch_count`` groups of similar total size (greedy LPT).
+
+    Files of equal size always share a batch, so a worker's content memo
+    sees every potential duplicate.
+    """
+
+    by_size: Dict[int, List[int]] = {}
+    for index, size in enumerate(sizes):
+        by_size.setdefault(size, []).append(index)
+    heap = [(0, batch) for batch in range(batch_count)]
+    groups: List[List[int]] = [[] for _ in range(batch_count)]
+    for size, members in sorted(by_size.items(), key=lambda item: item[0] * len(item[1]), reverse=True):
+        load, batch = heapq.heappop(heap)
+        groups[batch].extend(members)
+        heapq.heappush(heap, (load + size * len(members), batch))
+    return [sorted(group) for group in groups if group]
+
+
 class RepositoryScanner:
     """Analyse a repository for opportunities and risks."""
 
-    def __init__(self, root: Path | str) -> None:
+    def __init__(
+        self,
+        root: Path | str,
+        cache: ScanCache | Path | str | None = None,
+        use_ignore_files: bool = True,
+        workers: int = 1,
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+        mmap_threshold: int = DEFAULT_MMAP_THRESHOLD,
+        base_ref: Optional[str] = None,
+        index: TrigramIndex | Path | str | None = None,
+        dedupe: bool = True,
+        scan_archives: bool = False,
+        archive_limits: Optional[ArchiveLimits] = None,
+    ) -> None:
         self.root = Path(root).expanduser().resolve()
         if not self.root.exists():
             raise FileNotFoundError(self.root)
+        self.cache = ScanCache(cache) if isinstance(cache, (str, Path)) else cache
+        self.use_ignore_files = use_ignore_files
+        self.workers = max(1, workers)
+        self.limits = ScanLimits(max_file_size=max_file_size, mmap_threshold=mmap_threshold)
+        self.base_ref = base_ref
+        self.index = TrigramIndex(index) if isinstance(index, (str, Path)) else index
+        self.dedupe = dedupe
+        self.scan_archives = scan_archives
+        self.archive_limits = archive_limits or ArchiveLimits()
+        self.io = ScanCounters()
+        self._io_lock = threading.Lock()
+        self._io_local = threading.local()
 
     # ------------------------------------------------------------------
     def iter_files(
         self,
         patterns: Iterable[str] = DEFAULT_FILE_PATTERNS,
         exclude_dirs: Iterable[str] = EXCLUDED_DIRECTORIES,
+        base_ref: Optional[str] = None,
+    ) -> Iterator[Path]:
+        """Yield files under ``root`` filtered by ``patterns``.
+
+        Excluded and ignored directories are pruned without being entered.
+        With a ``base_ref`` (or one given to the constructor) only files
+        changed against it plus untracked files are yielded; without git
+        this falls back to the full walk, while a ref git cannot resolve
+        raises :class:`ValueError`. With ``scan_archives`` the members
+        of zip archives that match ``patterns`` are yielded as
+        ``archive.zip!/inner/path`` in place of the archive.
+        """
+
+        walked = 0
+        try:
+            for path in self._iter_paths(patterns, exclude_dirs, base_ref):
+                walked += 1
+                yield path
+        finally:
+            with self._io_lock:
+                self.io.files_walked += walked
+
+    def _iter_paths(
+        self,
+        patterns: Iterable[str],
+        exclude_dirs: Iterable[str],
+        base_ref: Optional[str],
     ) -> Iterator[Path]:
-        """Yield files under ``root`` filtered by ``patterns``."""
+        """:meth:`iter_files` without counting the files in ``io``."""
 
-        compiled = [re.compile(fnmatch.translate(pattern)) for pattern in patterns]
+        patterns = tuple(patterns)
         excluded = set(exclude_dirs)
-        for path in self.root.rglob("*"):
-            if any(parent.name in excluded for parent in path.parents):
-                continue
-            if path.is_file() and any(regex.match(path.name) for regex in compiled):
+        files = self._iter_tree(patterns + ARCHIVE_PATTERNS if self.scan_archives else patterns, excluded, base_ref)
+        if self.scan_archives:
+            matcher = FileMatcher(patterns)
+            files = expand_archives(
+                files,
+                self.archive_limits,
+                accept=lambda inner: matcher(inner.name) and not excluded.intersection(inner.parts[:-1]),
+                keep=lambda archive: matcher(archive.name),
+            )
+        return files
+
+    def _iter_tree(
+        self,
+        patterns: Sequence[str],
+        excluded: Set[str],
+        base_ref: Optional[str],
+    ) -> Iterator[Path]:
+        ref = base_ref or self.base_ref
+        changed = changed_files(self.root, ref) if ref else None
+        if changed is None:
+            yield from walk_files(self.root, patterns, excluded, use_ignore_files=self.use_ignore_files)
+            return
+        matcher = FileMatcher(patterns)
+        for path in changed:
+            relative = path.relative_to(self.root)
+            if matcher(path.name) and not excluded.intersection(relative.parts[:-1]):
                 yield path
 
+    # ------------------------------------------------------------------
+    def tree_fingerprint(
+        self,
+        patterns: Iterable[str] = DEFAULT_FILE_PATTERNS,
+        base_ref: Optional[str] = None,
+        extra: Iterable[Path] = (),
+    ) -> str:
+        """Digest of the path and metadata of every file a scan would visit.
+
+        Only ``stat`` is called, never ``read``, so it is cheap next to a scan
+        and changes whenever a scan's result could. ``extra`` adds paths
+        (such as required files) whose presence matters as well. The walk is
+        not counted in ``io``, which only reports the scans themselves.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        for path in (*self._iter_paths(patterns, EXCLUDED_DIRECTORIES, base_ref), *extra):
+            member = split_member(path)
+            try:
+                stat = (member[0] if member is not None else path).stat()
+                entry = f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{stat.st_ino}\n"
+            except OSError:
+                entry = f"{path}\0-\n"
+            digest.update(entry.encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
     # ------------------------------------------------------------------
     def collect_stats(self, patterns: Iterable[str] = DEFAULT_FILE_PATTERNS) -> RepositoryStats:
-        """Return counts that provide a quick overview of the repository."""
-
-        extension_counter: Counter[str] = Counter()
-        file_count = 0
-        line_count = 0
-        for file in self.iter_files(patterns=patterns):
-            file_count += 1
-            extension_counter[file.suffix] += 1
-            with file.open("r", encoding="utf-8", errors="ignore") as handle:
-                line_count += sum(1 for _ in handle)
-        return RepositoryStats(file_count=file_count, line_count=line_count, extensions=dict(extension_counter))
+        """Return counts that provide a quick overview of the repository.
+
+        Binary files and files above ``max_file_size`` count as zero lines.
+        """
+
+        files = list(self.iter_files(patterns=patterns))
+        extension_counter: Counter[str] = Counter(file.suffix for file in files)
+        cache = self.cache
+        with self._tracking_io():
+            line_counts = self._process_files(
+                files,
+                partial(_count_lines, self.limits),
+                lookup=cache.get_line_count if cache is not None else None,
+                store=cache.set_line_count if cache is not None else None,
+            )
+        return RepositoryStats(file_count=len(files), line_count=sum(line_counts), extensions=dict(extension_counter))
 
     # ------------------------------------------------------------------
     def search_pattern(
         self,
         pattern: str | Pattern[str],
         file_patterns: Iterable[str] = DEFAULT_FILE_PATTERNS,
-    ) -> List[Tuple[Path, List[str]]]:
+    ) -> List[Tuple[Path, FileMatches]]:
         """Search for ``pattern`` and return matching lines grouped by file."""
 
-        compiled = re.compile(pattern) if isinstance(pattern, str) else pattern
-        matches: List[Tuple[Path, List[str]]] = []
-        for file in self.iter_files(patterns=file_patterns):
-            hits: List[str] = []
-            with file.open("r", encoding="utf-8", errors="ignore") as handle:
-                for lineno, line in enumerate(handle, start=1):
-                    if compiled.search(line):
-                        hits.append(f"{lineno}: {line.rstrip()}")
-            if hits:
-                matches.append((file, hits))
+        return self.scan_rules({"pattern": pattern}, file_patterns=file_patterns)["pattern"]
+
+    # ------------------------------------------------------------------
+    def scan_rules(
+        self,
+        rules: RuleSet | Mapping[str, str | Pattern[str]],
+        file_patterns: Iterable[str] = DEFAULT_FILE_PATTERNS,
+        base_ref: Optional[str] = None,
+    ) -> Dict[str, List[Tuple[Path, FileMatches]]]:
+        """Evaluate every rule in one walk, reading each file only once.
+
+        With a trigram ``index`` only files containing the literal text the
+        rules require are read; rules without such literals scan every file.
+        Each file's hits are a :class:`FileMatches` that reads line text
+        lazily but otherwise behaves like a list of ``"lineno: line"``.
+        """
+
+        ruleset = rules if isinstance(rules, RuleSet) else RuleSet(rules)
+        matches: Dict[str, List[Tuple[Path, FileMatches]]] = {name: [] for name in ruleset.rules}
+        cache = self.cache
+        with self._tracking_io():
+            files = self._narrow(list(self.iter_files(patterns=file_patterns, base_ref=base_ref)), ruleset)
+            results = self._process_files(
+                files,
+                _ScanTask(ruleset, self.limits, dedupe=self.dedupe),
+                lookup=partial(cache.get_hits, fingerprint=ruleset.fingerprint) if cache is not None else None,
+                store=(lambda file, stat, hits: cache.set_hits(file, stat, ruleset.fingerprint, hits)) if cache is not None else None,
+            )
+        table = PathTable()
+        for file, hits in zip(files, results):
+            if not hits:
+                continue
+            path_id = table.intern(file)
+            for name, (linenos, offsets) in hits.items():
+                matches[name].append((file, FileMatches(table, path_id, linenos, offsets)))
         return matches
 
     # ------------------------------------------------------------------
-    def detect_high_risk_patterns(self) -> Dict[str, List[Tuple[Path, List[str]]]]:
+    def iter_rule_matches(
+        self,
+        rules: RuleSet | Mapping[str, str | Pattern[str]],
+        file_patterns: Iterable[str] = DEFAULT_FILE_PATTERNS,
+        base_ref: Optional[str] = None,
+        max_hits: Optional[int] = None,
+        max_hits_per_file: Optional[int] = None,
+        first_match_only: bool = False,
+        files: Optional[Iterable[Path]] = None,
+    ) -> Iterator[Tuple[str, Path, LineMatch]]:
+        """Stream ``(rule, path, match)`` as matches are found.
+
+        ``max_hits`` caps the whole scan, ``max_hits_per_file`` caps each rule
+        within a file and ``first_match_only`` is shorthand for a cap of one.
+        Files are walked lazily and serially, so closing the generator stops
+        the scan without visiting the rest of the tree; ``files`` replaces
+        the walk with an explicit list. With ``workers`` > 1 and no
+        ``max_hits`` the files are instead scanned in worker batches and
+        their matches yielded once the batches finish. ``str(match)`` gives the familiar
+        ``"lineno: line"`` and reads the line only then.
+        """
+
+        ruleset = rules if isinstance(rules, RuleSet) else RuleSet(rules)
+        limit = 1 if first_match_only else max_hits_per_file
+        if max_hits is not None and max_hits <= 0:
+            return
+        fingerprint = ruleset.fingerprint if limit is None else f"{ruleset.fingerprint}:{limit}"
+        with self._tracking_io():
+            if files is None:
+                files = self.iter_files(patterns=file_patterns, base_ref=base_ref)
+            if self.index is not None:
+                files = self._narrow(list(files), ruleset)
+            if self.workers > 1 and max_hits is None:
+                yield from self._batched_rule_matches(ruleset, list(files), limit, fingerprint)
+                return
+            cache = self.cache
+            memo: Dict[bytes, Dict[str, Positions]] = {}
+            emitted = 0
+            try:
+                for file in files:
+                    stat = _stat(file) if cache is not None else None
+                    if stat is not None and not self.limits.allows(stat.st_size):
+                        # Oversized files bypass the cache both ways so a raised limit rescans them.
+                        stat = None
+                    cached = cache.get_hits(file, stat, fingerprint) if stat is not None else None
+                    if cached is not None:
+                        records = [
+                            (name, LineMatch(file, lineno, offset))
+                            for name, lineno, offset in _ordered_positions(ruleset, cached, limit)
+                        ]
+                        if max_hits is not None:
+                            records = records[:max_hits - emitted]
+                        # Cached files are not open yet; fetch their lines in one go.
+                        LineMatch.preload([record for _name, record in records])
+                        for name, record in records:
+                            yield name, file, record
+                            emitted += 1
+                            if max_hits is not None and emitted >= max_hits:
+                                return
+                        continue
+                    found: Dict[str, Positions] = {}
+                    with _open_buffer(file, self.limits) as buffer:
+                        digest = _content_digest(buffer) if buffer is not None and self.dedupe else None
+                        known = memo.get(digest) if digest is not None else None
+                        if known is not None:
+                            found = known
+                            positions: Iterable[Tuple[str, int, int]] = _ordered_positions(ruleset, known, limit)
+                        else:
+                            positions = ruleset.iter_positions(buffer, limit) if buffer is not None else ()
+                        for name, lineno, offset in positions:
+                            if known is None:
+                                linenos, offsets = found.get(name) or found.setdefault(name, new_positions())
+                                linenos.append(lineno)
+                                offsets.append(offset)
+                            yield name, file, LineMatch(file, lineno, offset)
+                            emitted += 1
+                            if max_hits is not None and emitted >= max_hits:
+                                return
+                    # Only files scanned to the end are complete enough to cache or share.
+                    if digest is not None:
+                        memo[digest] = found
+                    if stat is not None:
+                        cache.set_hits(file, stat, fingerprint, found)
+            finally:
+                if cache is not None:
+                    cache.save()
+
+    def _batched_rule_matches(
+        self,
+        ruleset: RuleSet,
+        files: List[Path],
+        limit: Optional[int],
+        fingerprint: str,
+    ) -> Iterator[Tuple[str, Path, LineMatch]]:
+        cache = self.cache
+        results = self._process_files(
+            files,
+            _ScanTask(ruleset, self.limits, dedupe=self.dedupe, limit=limit),
+            lookup=partial(cache.get_hits, fingerprint=fingerprint) if cache is not None else None,
+            store=(lambda file, stat, hits: cache.set_hits(file, stat, fingerprint, hits)) if cache is not None else None,
+        )
+        for file, hits in zip(files, results):
+            if not hits:
+                continue
+            records = [
+                (name, LineMatch(file, lineno, offset)) for name, lineno, offset in _ordered_positions(ruleset, hits, limit)
+            ]
+            LineMatch.preload([record for _name, record in records])
+            for name, record in records:
+                yield name, file, record
+
+    def iter_pattern(
+        self,
+        pattern: str | Pattern[str],
+        file_patterns: Iterable[str] = DEFAULT_FILE_PATTERNS,
+        max_hits: Optional[int] = None,
+        max_hits_per_file: Optional[int] = None,
+        first_match_only: bool = False,
+    ) -> Iterator[Tuple[Path, LineMatch]]:
+        """Streaming counterpart of :meth:`search_pattern`."""
+
+        for _name, path, hit in self.iter_rule_matches(
+            {"pattern": pattern},
+            file_patterns=file_patterns,
+            max_hits=max_hits,
+            max_hits_per_file=max_hits_per_file,
+            first_match_only=first_match_only,
+        ):
+            yield path, hit
+
+    # ------------------------------------------------------------------
+    def read_file(self, path: Path) -> Optional[bytes]:
+        """Contents of a file or archive member, or ``None`` if it is binary or too big."""
+
+        with self._tracking_io(), _open_buffer(path, self.limits) as buffer:
+            return None if buffer is None else bytes(buffer)
+
+    def map_contents(self, task: Callable[[Optional[bytes]], _T], files: Sequence[Path]) -> List[_T]:
+        """Apply ``task`` to the contents of ``files`` as :meth:`read_file` returns them.
+
+        With ``workers`` > 1 long lists are split into batches run in worker
+        processes, so ``task`` must be picklable. Results follow the order of
+        ``files`` and reads made in the workers are counted in ``io``.
+        """
+
+        with self._tracking_io():
+            return self._map_files(_ContentTask(task, self.limits), files)
+
+    def io_snapshot(self) -> ScanCounters:
+        """A consistent copy of ``io``, which other threads may be updating."""
+
+        with self._io_lock:
+            return self.io.copy()
+
+    @contextmanager
+    def _tracking_io(self) -> Iterator[None]:
+        """Attribute the reads this thread makes meanwhile to ``self.io``."""
+
+        local = self._io_local
+        if getattr(local, "depth", 0):
+            yield
+            return
+        local.depth = 1
+        reads = _reads()
+        before = reads.copy()
+        try:
+            yield
+        finally:
+            local.depth = 0
+            delta = reads.since(before)
+            with self._io_lock:
+                self.io.files_read += delta.files_read
+                self.io.bytes_read += delta.bytes_read
+
+    def _narrow(self, files: List[Path], ruleset: RuleSet) -> List[Path]:
+        """Drop files the trigram index rules out; archive members are never indexed."""
+
+        if self.index is None:
+            return files
+        on_disk = [file for file in files if split_member(file) is None]
+        allowed = set(self.index.narrow(on_disk, ruleset.rules.values(), partial(_read_for_index, self.limits)))
+        return [file for file in files if file in allowed or split_member(file) is not None]
+
+    def _process_files(
+        self,
+        files: Sequence[Path],
+        task: Callable[[Path], _T],
+        lookup: Optional[Callable[..., Optional[_T]]] = None,
+        store: Optional[Callable[..., None]] = None,
+    ) -> List[_T]:
+        """Apply ``task`` to ``files``, reusing cached results where possible.
+
+        Results are returned in the order of ``files`` regardless of how the
+        work was split across processes.
+        """
+
+        # Oversized files are neither looked up nor stored, so a raised limit
+        # never serves the empty result recorded while they were skipped.
+        stats = (
+            [
+                stat if stat is not None and self.limits.allows(stat.st_size) else None
+                for stat in (_stat(file) for file in files)
+            ]
+            if lookup is not None or store is not None
+            else [None] * len(files)
+        )
+        results: List[Optional[_T]] = (
+            [lookup(file, stat) if stat is not None else None for file, stat in zip(files, stats)]
+            if lookup is not None
+            else [None] * len(files)
+        )
+        missing = [index for index, result in enumerate(results) if result is None]
+        computed = self._map_files(task, [files[index] for index in missing])
+        for index, value in zip(missing, computed):
+            results[index] = value
+            if store is not None and stats[index] is not None:
+                store(files[index], stats[index], value)
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    def _map_files(self, task: Callable[[Path], _T], files: Sequence[Path]) -> List[_T]:
+        if self.workers <= 1 or len(files) < self.workers * MIN_FILES_PER_WORKER:
+            return _run_batch(task, files)
+        sizes = []
+        for file in files:
+            try:
+                sizes.append(file.stat().st_size if split_member(file) is None else member_size(file))
+            except OSError:
+                sizes.append(0)
+        batches = _balanced_batches(sizes, self.workers * BATCHES_PER_WORKER)
+        results: List[Optional[_T]] = [None] * len(files)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            outputs = pool.map(
+                _run_counted_batch, [task] * len(batches), [[files[index] for index in batch] for batch in batches]
+            )
+            reads = _reads()
+            for batch, (output, files_read, bytes_read) in zip(batches, outputs):
+                reads.files_read += files_read
+                reads.bytes_read += bytes_read
+                for index, value in zip(batch, output):
+                    results[index] = value
+        return results
+
+    # ------------------------------------------------------------------
+    def detect_high_risk_patterns(self, base_ref: Optional[str] = None) -> Dict[str, List[Tuple[Path, FileMatches]]]:
         """Look for code smells that merit a manual review."""
 
-        patterns = {
-            "dangerous_eval": r"\beval\s*\(",
-            "hardcoded_secret": r"(?i)(api_key|secret|password)\s*[=:]",
-            "broad_exception": r"except\s+Exception",
-        }
-        return {name: self.search_pattern(regex) for name, regex in patterns.items()}
+        return self.scan_rules(HIGH_RISK_PATTERNS, base_ref=base_ref)
 
     # ------------------------------------------------------------------
     def load_package_dependencies(self, package_json: Optional[Path] = None) -> Dict[str, Dict[str, str]]:
@@ -105,4 +896,4 @@ class RepositoryScanner:
         }
 
 
-__all__ = ["RepositoryScanner", "RepositoryStats"]
+__all__ = ["HIGH_RISK_PATTERNS", "RepositoryScanner", "RepositoryStats", "RuleSet", "ScanCounters", "ScanLimits"]
@@ -1,11 +1,24 @@
 """Ethical and safety checks for Kai's self-governance."""
 from __future__ import annotations
 
+import os
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .scanner import RepositoryScanner
+from .archives import split_member
+from .ast_rules import PythonRuleEngine
+from .issue_store import Baseline, IssueStore, StoredIssue, issue_fingerprint
+from .matches import LineMatch, Positions
+from .scan_cache import ScanCache
+from .scanner import HIGH_RISK_PATTERNS, RepositoryScanner
+
+if TYPE_CHECKING:
+    from .watch import AuditWatcher
+
+
+REGEX_TIMING = "<regex>"
 
 
 @dataclass
@@ -13,28 +26,148 @@ class AuditIssue:
     severity: str
     message: str
     location: Optional[str] = None
+    category: Optional[str] = None
+    path: Optional[str] = None
+    fingerprint: Optional[str] = None
+    status: Optional[str] = None
+
+
+class _PythonRulesTask:
+    """AST hits for one file's contents plus the rule time they cost.
+
+    Worker processes get a fresh engine built from the same rules instead
+    of a copy of the parent's tree cache.
+    """
+
+    def __init__(self, engine: PythonRuleEngine) -> None:
+        self.engine = engine
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"rules": self.engine.rules}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.engine = PythonRuleEngine(state["rules"])
+
+    def __call__(self, data: Optional[bytes]) -> Tuple[Optional[Dict[str, Positions]], Dict[str, float]]:
+        if data is None:
+            return {}, {}
+        timings = self.engine.timings
+        before = dict(timings)
+        hits = self.engine.scan(data, limit=1)
+        return hits, {name: timings[name] - before.get(name, 0.0) for name in timings}
 
 
 class SelfAuditor:
     """Run lightweight safety and coherence audits."""
 
-    def __init__(self, repository_root: Path | str) -> None:
-        self.scanner = RepositoryScanner(repository_root)
+    def __init__(
+        self,
+        repository_root: Path | str,
+        cache: ScanCache | Path | str | None = None,
+        scan_archives: bool = False,
+        issue_store: IssueStore | Path | str | None = None,
+        python_rules: PythonRuleEngine | bool = True,
+        workers: int = 1,
+    ) -> None:
+        self.scanner = RepositoryScanner(repository_root, cache=cache, scan_archives=scan_archives, workers=workers)
+        self.issue_store = IssueStore(issue_store) if isinstance(issue_store, (str, Path)) else issue_store
+        self.python_rules: Optional[PythonRuleEngine] = (
+            PythonRuleEngine() if python_rules is True else python_rules or None
+        )
+        self.rule_timings: Dict[str, float] = {}
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.scanner.root).as_posix()
+        except ValueError:
+            return path.as_posix()
 
     # ------------------------------------------------------------------
-    def run_static_checks(self) -> List[AuditIssue]:
-        results = self.scanner.detect_high_risk_patterns()
-        issues: List[AuditIssue] = []
-        for category, matches in results.items():
-            for path, lines in matches:
-                issues.append(
-                    AuditIssue(
-                        severity="high" if category == "dangerous_eval" else "medium",
-                        message=f"{category} detected",
-                        location=f"{path}:{lines[0] if lines else ''}",
-                    )
+    def _python_hits(self, engine: PythonRuleEngine, files: Sequence[Path]) -> List[Optional[Dict[str, Positions]]]:
+        """First AST hit per rule in each file; ``None`` where it must use the regex rules.
+
+        Files missing from the cache are parsed through the scanner, in
+        worker batches when it has ``workers`` > 1.
+        """
+
+        cache = self.scanner.cache
+        fingerprint = f"ast:{engine.fingerprint}:1"
+        stats: List[Optional[os.stat_result]] = [None] * len(files)
+        results: List[Optional[Dict[str, Positions]]] = [None] * len(files)
+        if cache is not None:
+            for index, path in enumerate(files):
+                if split_member(path) is not None:
+                    continue
+                stat = path.stat()
+                if self.scanner.limits.allows(stat.st_size):
+                    stats[index] = stat
+                    results[index] = cache.get_hits(path, stat, fingerprint)
+        missing = [index for index, result in enumerate(results) if result is None]
+        computed = self.scanner.map_contents(_PythonRulesTask(engine), [files[index] for index in missing])
+        timings = dict.fromkeys(engine.timings, 0.0)
+        for index, (hits, spent) in zip(missing, computed):
+            results[index] = hits
+            for name, seconds in spent.items():
+                timings[name] = timings.get(name, 0.0) + seconds
+            stat = stats[index]
+            if hits is not None and stat is not None:
+                cache.set_hits(files[index], stat, fingerprint, hits)
+        # Worker engines keep their own clocks, so the per-file times are summed here.
+        engine.timings = timings
+        return results
+
+    def run_static_checks(
+        self,
+        base_ref: Optional[str] = None,
+        files: Optional[Iterable[Path]] = None,
+    ) -> List[AuditIssue]:
+        # Only the first hit per category and file is reported, so the scan
+        # stops reading a file once every category has matched in it.
+        # Python sources go through the AST rules; everything else, and any
+        # Python file that does not parse, goes through the regex rules.
+        # ``files`` restricts the check to those paths instead of walking.
+        # With scanner ``workers`` > 1 both passes run in worker batches.
+        files = list(self.scanner.iter_files(base_ref=base_ref) if files is None else files)
+        order = {file: index for index, file in enumerate(files)}
+        found: List[Tuple[str, Path, LineMatch]] = []
+        regex_files = files
+        engine = self.python_rules
+        if engine is not None:
+            engine.reset_timings()
+            python_files = [file for file in files if file.suffix == ".py"]
+            python_hits = dict(zip(python_files, self._python_hits(engine, python_files)))
+            regex_files = []
+            for file in files:
+                hits = python_hits.get(file)
+                if hits is None:
+                    regex_files.append(file)
+                    continue
+                records = [
+                    (name, file, LineMatch(file, lineno, offset))
+                    for name, (linenos, offsets) in hits.items()
+                    for lineno, offset in zip(linenos, offsets)
+                ]
+                LineMatch.preload([record for _name, _file, record in records])
+                found.extend(records)
+        started = time.perf_counter()
+        found.extend(self.scanner.iter_rule_matches(HIGH_RISK_PATTERNS, first_match_only=True, files=regex_files))
+        self.rule_timings = {**(engine.timings if engine is not None else {}), REGEX_TIMING: time.perf_counter() - started}
+        found.sort(key=lambda item: order[item[1]])
+
+        grouped: Dict[str, List[AuditIssue]] = {category: [] for category in HIGH_RISK_PATTERNS}
+        for category, path, line in found:
+            relative = self._relative(path)
+            grouped.setdefault(category, []).append(
+                AuditIssue(
+                    severity="high" if category == "dangerous_eval" else "medium",
+                    message=f"{category} detected",
+                    location=f"{path}:{line}",
+                    category=category,
+                    path=relative,
+                    fingerprint=issue_fingerprint(category, relative, line.text),
                 )
-        return issues
+            )
+        return [issue for issues in grouped.values() for issue in issues]
 
     # ------------------------------------------------------------------
     def verify_mandatory_files(self, required: Iterable[str]) -> List[AuditIssue]:
@@ -45,16 +178,72 @@ class SelfAuditor:
                     AuditIssue(
                         severity="high",
                         message=f"Required file '{relative}' is missing.",
+                        category="missing_file",
+                        path=relative,
+                        fingerprint=issue_fingerprint("missing_file", relative),
                     )
                 )
         return missing
 
     # ------------------------------------------------------------------
-    def audit(self, required_files: Optional[Iterable[str]] = None) -> List[AuditIssue]:
-        issues = self.run_static_checks()
+    def audit(
+        self,
+        required_files: Optional[Iterable[str]] = None,
+        base_ref: Optional[str] = None,
+        baseline: Optional[Baseline] = None,
+        label: Optional[str] = None,
+    ) -> List[AuditIssue]:
+        """Run every check; with ``base_ref`` only files changed against it are scanned.
+
+        With an ``issue_store`` each run is recorded (tagged with ``label``).
+        Passing ``baseline`` (an audit id, a label or ``"latest"``) returns
+        only the delta against that earlier audit: issues absent from it
+        with ``status="new"`` followed by issues that disappeared with
+        ``status="resolved"``. Compare audits of the same scope; a
+        ``base_ref`` audit against a full one reports unscanned files as
+        resolved. A ``base_ref`` git cannot resolve raises :class:`ValueError`.
+        """
+
+        issues = self.run_static_checks(base_ref=base_ref)
         if required_files:
             issues.extend(self.verify_mandatory_files(required_files))
-        return issues
+        store = self.issue_store
+        if store is None:
+            if baseline is not None:
+                raise ValueError("A baseline needs an issue_store to compare against.")
+            return issues
+        baseline_id = store.resolve(baseline) if baseline is not None else None
+        current_id = store.record(issues, root=str(self.scanner.root), base_ref=base_ref, label=label)
+        if baseline is None:
+            return issues
+        delta = store.diff(baseline_id, current_id)
+        return [
+            *(_from_stored(issue, "new") for issue in delta.new),
+            *(_from_stored(issue, "resolved") for issue in delta.resolved),
+        ]
+
+
+    # ------------------------------------------------------------------
+    def watch(self, required_files: Optional[Iterable[str]] = None, **options: object) -> AuditWatcher:
+        """Start an :class:`~core.watch.AuditWatcher` that keeps this audit hot."""
+
+        from .watch import AuditWatcher
+
+        watcher = AuditWatcher(self, required_files=required_files, **options)  # type: ignore[arg-type]
+        watcher.start()
+        return watcher
+
+
+def _from_stored(issue: StoredIssue, status: str) -> AuditIssue:
+    return AuditIssue(
+        severity=issue.severity,
+        message=issue.message,
+        location=issue.location,
+        category=issue.category,
+        path=issue.path,
+        fingerprint=issue.fingerprint,
+        status=status,
+    )
 
 
 __all__ = ["SelfAuditor", "AuditIssue"]
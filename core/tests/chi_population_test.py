@@ -0,0 +1,134 @@
+from dataclasses import replace
+from pathlib import Path
+import random
+import sys
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from core.chi_engine import CHIEngine, CHIState, CHIThresholds
+
+if np is not None:
+    from core.chi_population import SEVERITIES, CHIPopulation
+
+# Inputs that land exactly on or right next to the 4-digit rounding ties.
+EDGE_INPUTS = (0.0, 0.00005, 0.00015, 0.03125, 0.12345, 0.5, -0.00005, 1e-17, 0.45, 0.35)
+FIELDS = ("impact", "noise", "workload", "recovery")
+
+
+def random_inputs(rng, agents):
+    def draw():
+        if rng.random() < 0.2:
+            return rng.choice(EDGE_INPUTS) * rng.choice((1, -1))
+        return rng.uniform(-0.6, 0.6)
+
+    return {name: np.array([draw() for _ in range(agents)]) for name in FIELDS}
+
+
+def random_states(rng, agents):
+    return [
+        CHIState(
+            energy=round(rng.uniform(0.0, 1.0), 4),
+            coherence=round(rng.uniform(0.3, 1.0), 4),
+            entropy=round(rng.uniform(0.0, 0.9), 4),
+            fatigue=round(rng.uniform(0.0, 0.8), 4),
+        )
+        for _ in range(agents)
+    ]
+
+
+def threshold_states():
+    """States on, and one rounding step either side of, every audit and mode threshold."""
+
+    limits = CHIThresholds()
+    states = []
+    for field, value in (
+        ("coherence", limits.critical_coherence),
+        ("entropy", limits.saturated_entropy),
+        ("fatigue", limits.saturated_fatigue),
+        ("energy", limits.low_energy),
+        ("coherence", limits.safe_mode_coherence),
+        ("entropy", limits.safe_mode_entropy),
+        ("fatigue", limits.rest_fatigue),
+        ("energy", limits.rest_energy),
+        ("coherence", limits.focus_coherence),
+        ("entropy", limits.focus_entropy),
+    ):
+        for offset in (-0.0001, 0.0, 0.0001):
+            base = CHIState(energy=0.8, coherence=0.9, entropy=0.2, fatigue=0.1)
+            states.append(replace(base, **{field: round(value + offset, 4)}))
+    return states
+
+
+@unittest.skipIf(np is None, "CHIPopulation requires NumPy")
+class CHIPopulationParityTests(unittest.TestCase):
+    def assertMatchesEngines(self, population, engines, severities=None):
+        # ``audit`` updates ``last_alert``, so the engines audit before states are compared.
+        expected = [engine.audit().severity for engine in engines] if severities is not None else None
+        for index, engine in enumerate(engines):
+            self.assertEqual(population.state(index), engine.state, f"agent {index}")
+            if expected is not None:
+                self.assertEqual(SEVERITIES[severities[index]], expected[index], f"agent {index}")
+
+    def test_random_streams_match_scalar_engines(self):
+        rng = random.Random(7)
+        states = random_states(rng, 300)
+        engines = [CHIEngine(replace(state)) for state in states]
+        population = CHIPopulation.from_states(states)
+        for step in range(150):
+            if rng.random() < 0.1:
+                population.restore()
+                for engine in engines:
+                    engine.restore()
+            else:
+                inputs = random_inputs(rng, len(engines))
+                population.adjust(**inputs)
+                for index, engine in enumerate(engines):
+                    engine.adjust(**{name: float(values[index]) for name, values in inputs.items()})
+            severities = population.audit() if step % 3 == 0 else None
+            self.assertMatchesEngines(population, engines, severities)
+
+    def test_rounding_ties_match_builtin_round(self):
+        ties = [tie * sign for tie in EDGE_INPUTS for sign in (1, -1)]
+        ties += [(index + 0.5) / 1e4 for index in range(0, 10000, 37)]
+        ties += [float(np.nextafter(value, direction)) for value in ties for direction in (-1.0, 2.0)]
+        states = [CHIState(energy=0.0, coherence=0.5, entropy=0.5, fatigue=0.5) for _ in ties]
+        engines = [CHIEngine(replace(state)) for state in states]
+        population = CHIPopulation.from_states(states)
+        population.adjust(recovery=np.array(ties), impact=np.array(ties))
+        for engine, value in zip(engines, ties):
+            engine.adjust(recovery=value, impact=value)
+        self.assertMatchesEngines(population, engines)
+
+    def test_threshold_edges_match_audit_and_modes(self):
+        states = threshold_states()
+        engines = [CHIEngine(replace(state)) for state in states]
+        population = CHIPopulation.from_states(states)
+        self.assertMatchesEngines(population, engines, population.audit())
+        population.adjust()
+        for engine in engines:
+            engine.adjust()
+        self.assertMatchesEngines(population, engines, population.audit())
+
+    def test_custom_thresholds_match_scalar_engines(self):
+        limits = CHIThresholds(critical_coherence=0.6, low_energy=0.5, rest_fatigue=0.4, focus_coherence=0.7)
+        rng = random.Random(11)
+        states = random_states(rng, 200)
+        engines = [CHIEngine(replace(state), thresholds=limits) for state in states]
+        population = CHIPopulation.from_states(states, limits)
+        for _ in range(40):
+            inputs = random_inputs(rng, len(engines))
+            population.adjust(**inputs)
+            for index, engine in enumerate(engines):
+                engine.adjust(**{name: float(values[index]) for name, values in inputs.items()})
+            self.assertMatchesEngines(population, engines, population.audit())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from core.git_changes import changed_files
+from core.selfaudit import SelfAuditor
+
+
+def git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=root,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class ChangedFilesTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        git(self.root, "init", "-q")
+        (self.root / "kept.py").write_text("x = 1\n", encoding="utf-8")
+        git(self.root, "add", "kept.py")
+        git(self.root, "commit", "-q", "-m", "base")
+        (self.root / "new.py").write_text("y = 2\n", encoding="utf-8")
+
+    def test_known_ref_lists_changed_files(self):
+        self.assertEqual(changed_files(self.root, "HEAD"), [self.root / "new.py"])
+
+    def test_unknown_ref_raises(self):
+        for ref in ("mian", "--output=/dev/null"):
+            with self.subTest(ref=ref), self.assertRaises(ValueError):
+                changed_files(self.root, ref)
+
+    def test_unknown_ref_does_not_fall_back_to_a_full_audit(self):
+        with self.assertRaises(ValueError):
+            SelfAuditor(self.root).run_static_checks(base_ref="mian")
+
+    def test_outside_a_checkout_falls_back(self):
+        self.assertIsNone(changed_files(tempfile.mkdtemp(), "HEAD"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from pathlib import Path
+from unittest import mock
+import ast
+import json
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from core.absorb_and_audit import AbsorptionOrchestrator
+from core.report_log import COMPACTION_FILE_NAME, ReportLog
+
+
+class Interrupted(Exception):
+    pass
+
+
+def filled_log(directory, count=3):
+    log = ReportLog(directory, max_segment_bytes=60)
+    for index in range(count):
+        log.append({"generated_at": f"2024-01-0{index + 1}", "approved": True, "chi_severity": "OPTIMO", "i": index})
+    return log
+
+
+class ReportLogCompactionTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+
+    def reopened_records(self):
+        log = ReportLog(self.directory, max_segment_bytes=60)
+        try:
+            return len(log), [record["i"] for record in log.query()]
+        finally:
+            log.close()
+
+    def test_compaction_drops_rejected_records(self):
+        log = filled_log(self.directory)
+        self.assertEqual(log.compact(keep=lambda record: record["i"] != 1), 1)
+        self.assertEqual([record["i"] for record in log.query()], [0, 2])
+        log.close()
+        self.assertEqual(self.reopened_records(), (2, [0, 2]))
+        self.assertFalse((self.directory / COMPACTION_FILE_NAME).exists())
+
+    def test_interrupted_swap_is_finished_on_open(self):
+        log = filled_log(self.directory)
+        with mock.patch.object(ReportLog, "_swap_segments", side_effect=Interrupted):
+            with self.assertRaises(Interrupted):
+                log.compact()
+        log.close()
+        self.assertTrue((self.directory / COMPACTION_FILE_NAME).exists())
+        self.assertEqual(self.reopened_records(), (3, [0, 1, 2]))
+        self.assertFalse((self.directory / COMPACTION_FILE_NAME).exists())
+
+    def test_interrupted_index_update_does_not_duplicate_records(self):
+        log = filled_log(self.directory)
+        swap = ReportLog._swap_segments
+
+        def swap_then_crash(self, old, new):
+            swap(self, old, new)
+            raise Interrupted
+
+        with mock.patch.object(ReportLog, "_swap_segments", swap_then_crash):
+            with self.assertRaises(Interrupted):
+                log.compact()
+        log.close()
+        self.assertEqual(self.reopened_records(), (3, [0, 1, 2]))
+
+    def test_interrupted_rewrite_keeps_the_old_segments(self):
+        log = filled_log(self.directory)
+        calls = []
+
+        def keep(record):
+            calls.append(record)
+            if len(calls) == 2:
+                raise Interrupted
+            return True
+
+        with self.assertRaises(Interrupted):
+            log.compact(keep=keep)
+        log.close()
+        # A partial segment left by a crash (not by an exception) is discarded too.
+        (self.directory / "reports-000009.jsonl.compact").write_text('{"i": 99}\n', encoding="utf-8")
+        self.assertEqual(self.reopened_records(), (3, [0, 1, 2]))
+        self.assertEqual(sorted(path.name for path in self.directory.glob("*.compact")), [])
+
+
+class ExportRunTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        (self.directory / "README.md").write_text("x\n", encoding="utf-8")
+        self.orchestrator = AbsorptionOrchestrator(self.directory)
+
+    def test_output_path_is_a_report_file(self):
+        target = self.directory / "out" / "report.json"
+        target.parent.mkdir()
+        target.write_text("old", encoding="utf-8")
+        self.assertEqual(self.orchestrator.export_run("objetivo", target), target)
+        self.assertIn("chi_severity", ast.literal_eval(target.read_text(encoding="utf-8")))
+
+    def test_log_appends_to_a_report_log(self):
+        logs = self.directory / "logs"
+        segment = self.orchestrator.export_run("uno", log=logs)
+        self.orchestrator.export_run("dos", log=logs)
+        self.assertEqual(segment.parent, logs.resolve())
+        log = ReportLog(logs)
+        try:
+            self.assertEqual(len(log), 2)
+        finally:
+            log.close()
+
+    def test_file_and_log_together(self):
+        target = self.directory / "report.json"
+        self.assertEqual(self.orchestrator.export_run("ambos", target, log=self.directory / "logs"), target)
+        self.assertTrue(target.is_file())
+        lines = next((self.directory / "logs").glob("reports-*.jsonl")).read_text(encoding="utf-8").splitlines()
+        self.assertIn("chi_severity", json.loads(lines[0]))
+
+    def test_nothing_to_export_to(self):
+        with self.assertRaises(ValueError):
+            self.orchestrator.export_run("nada")
+
+
+if __name__ == "__main__":
+    unittest.main()
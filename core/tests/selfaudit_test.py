@@ -0,0 +1,46 @@
+from pathlib import Path
+from unittest import mock
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from core import scanner
+from core.selfaudit import SelfAuditor
+
+SOURCES = (
+    ("py", "eval(x)\n"),
+    ("py", "password = 'abc'\n"),
+    ("py", "def broken(:\n    eval(y)\n"),
+    ("py", "try:\n    pass\nexcept Exception:\n    pass\n"),
+    ("py", "x = 1\n"),
+    ("js", "eval(x)\n"),
+    ("js", "const ok = 1;\n"),
+)
+
+
+class WorkerAuditTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        for index in range(70):
+            suffix, body = SOURCES[index % len(SOURCES)]
+            (self.root / f"file{index:02d}.{suffix}").write_text("# pad\n" * (index % 5) + body, encoding="utf-8")
+
+    def findings(self, auditor):
+        return [(issue.category, issue.location) for issue in auditor.run_static_checks()]
+
+    def test_workers_match_the_serial_audit(self):
+        serial = SelfAuditor(self.root)
+        batched = SelfAuditor(self.root, workers=2)
+        with mock.patch.object(scanner, "ProcessPoolExecutor", wraps=scanner.ProcessPoolExecutor) as pool:
+            found = self.findings(batched)
+        self.assertEqual(pool.call_count, 2)
+        self.assertEqual(found, self.findings(serial))
+        self.assertEqual(set(batched.rule_timings), set(serial.rule_timings))
+        self.assertEqual(batched.scanner.io.files_read, serial.scanner.io.files_read)
+
+
+if __name__ == "__main__":
+    unittest.main()
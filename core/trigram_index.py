@@ -0,0 +1,256 @@
+"""Persistent trigram index that narrows the files a regex has to visit.
+
+Every indexed file contributes the set of (ASCII-lowercased) byte trigrams it
+contains. Literal text that any match of a regex must include is turned into
+a trigram query, and only files holding all of those trigrams are searched.
+Regexes without usable literals produce no query and the caller scans every
+file as before. The index lives in SQLite and is refreshed incrementally from
+file size, ``mtime_ns`` and inode. Files the reader skipped (binary or over
+the size limit) and files modified too recently for their metadata to be
+trusted are flagged and read again on the next refresh, so a changed limit
+or a same-tick rewrite is never masked by a stale entry.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Set
+
+from .scan_cache import _RACY_WINDOW_NS
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+
+Query = Optional[List[FrozenSet[int]]]
+
+MAX_ALTERNATIVES = 16
+MAX_TRIGRAMS_PER_QUERY = 32
+# Under Unicode case folding these ASCII letters also match non-ASCII
+# characters (the Kelvin sign, long s, dotted and dotless i), whose bytes the
+# ASCII-lowercased index cannot stand in for.
+_UNICODE_FOLDED = frozenset(map(ord, "iksIKS"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    recheck INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_file ON postings (file_id);
+"""
+
+
+def extract_trigrams(data: bytes) -> Set[int]:
+    """Return the distinct lowercase trigrams of ``data`` as 24-bit integers.
+
+    Matching is line based, so windows spanning a newline are never needed;
+    repeated lines are only visited once.
+    """
+
+    windows: Set[bytes] = set()
+    for line in set(data.lower().split(b"\n")):
+        windows.update(line[i:i + 3] for i in range(len(line) - 2))
+    return {int.from_bytes(window, "big") for window in windows}
+
+
+def _literal_trigrams(text: str) -> Query:
+    try:
+        encoded = text.lower().encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if len(encoded) < 3:
+        return None
+    return [frozenset(int.from_bytes(encoded[i:i + 3], "big") for i in range(len(encoded) - 2))]
+
+
+def _and(left: Query, right: Query) -> Query:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    combined = [a | b for a in left for b in right]
+    if len(combined) > MAX_ALTERNATIVES:
+        return min(left, right, key=len)
+    return combined
+
+
+def _or(left: Query, right: Query) -> Query:
+    if left is None or right is None:
+        return None
+    combined = left + right
+    return combined if len(combined) <= MAX_ALTERNATIVES else None
+
+
+def _sequence_query(items: Iterable[tuple], flags: int, text: bool) -> Query:
+    """Query for a parsed sequence; ``flags`` are those in effect, ``text`` is a ``str`` pattern."""
+
+    folded = text and flags & re.IGNORECASE and not flags & re.ASCII
+    query: Query = None
+    run: List[str] = []
+
+    def flush() -> None:
+        nonlocal query
+        if run:
+            query = _and(query, _literal_trigrams("".join(run)))
+            run.clear()
+
+    for op, argument in items:
+        if op is sre_constants.LITERAL and argument < 128 and not (folded and argument in _UNICODE_FOLDED):
+            run.append(chr(argument))
+            continue
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            _group, add_flags, del_flags, body = argument
+            query = _and(query, _sequence_query(body, (flags | add_flags) & ~del_flags, text))
+        elif op is sre_constants.BRANCH:
+            branches = argument[1]
+            alternative = _sequence_query(branches[0], flags, text)
+            for branch in branches[1:]:
+                alternative = _or(alternative, _sequence_query(branch, flags, text))
+            query = _and(query, alternative)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and argument[0] >= 1:
+            query = _and(query, _sequence_query(argument[2], flags, text))
+    flush()
+    return query
+
+
+def regex_query(pattern: Pattern[str] | Pattern[bytes]) -> Query:
+    """Trigram query every match of ``pattern`` satisfies, or ``None`` if unknown."""
+
+    source = pattern.pattern
+    text = isinstance(source, str)
+    if not text:
+        source = source.decode("latin-1")
+    try:
+        parsed = sre_parse.parse(source, pattern.flags & ~re.UNICODE)
+    except (re.error, TypeError, ValueError):
+        return None
+    query = _sequence_query(parsed, parsed.state.flags, text)
+    if query is None or any(not alternative for alternative in query):
+        return None
+    return query
+
+
+class TrigramIndex:
+    """SQLite-backed trigram postings for a set of files."""
+
+    def __init__(self, index_file: Path | str) -> None:
+        self.index_file = Path(index_file).expanduser()
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.index_file))
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(files)")}
+        if "recheck" not in columns:
+            # Indexes written before the flag existed: re-read everything once.
+            with self._connection:
+                self._connection.execute("ALTER TABLE files ADD COLUMN recheck INTEGER NOT NULL DEFAULT 1")
+
+    # ------------------------------------------------------------------
+    def update(self, files: Sequence[Path], read: Callable[[Path], Optional[bytes]]) -> int:
+        """Re-index files whose metadata changed; return how many were read.
+
+        ``read`` returns a file's bytes, or ``None`` for files the scanner
+        would skip; those are recorded without postings and, like files
+        modified within the racy window, read again on the next update.
+        """
+
+        connection = self._connection
+        known: Dict[str, tuple] = {
+            path: (file_id, size, mtime_ns, inode, recheck)
+            for file_id, path, size, mtime_ns, inode, recheck in connection.execute(
+                "SELECT id, path, size, mtime_ns, inode, recheck FROM files"
+            )
+        }
+        now = time.time_ns()
+        refreshed = 0
+        with connection:
+            for file in files:
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                key = str(file)
+                previous = known.get(key)
+                if previous is not None and previous[1:] == (stat.st_size, stat.st_mtime_ns, stat.st_ino, 0):
+                    continue
+                data = read(file)
+                recheck = 1 if data is None or now - stat.st_mtime_ns < _RACY_WINDOW_NS else 0
+                if previous is not None:
+                    connection.execute("DELETE FROM postings WHERE file_id = ?", (previous[0],))
+                    connection.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ?, inode = ?, recheck = ? WHERE id = ?",
+                        (stat.st_size, stat.st_mtime_ns, stat.st_ino, recheck, previous[0]),
+                    )
+                    file_id = previous[0]
+                else:
+                    file_id = connection.execute(
+                        "INSERT INTO files (path, size, mtime_ns, inode, recheck) VALUES (?, ?, ?, ?, ?)",
+                        (key, stat.st_size, stat.st_mtime_ns, stat.st_ino, recheck),
+                    ).lastrowid
+                if data:
+                    connection.executemany(
+                        "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+                        ((trigram, file_id) for trigram in extract_trigrams(data)),
+                    )
+                refreshed += 1
+            listed = {str(file) for file in files}
+            for key, (file_id, *_rest) in known.items():
+                if key not in listed and not os.path.exists(key):
+                    connection.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                    connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        return refreshed
+
+    # ------------------------------------------------------------------
+    def candidates(self, query: List[FrozenSet[int]]) -> Set[str]:
+        """Paths of indexed files that satisfy at least one query alternative."""
+
+        paths: Set[str] = set()
+        for alternative in query:
+            trigrams = sorted(alternative)[:MAX_TRIGRAMS_PER_QUERY]
+            placeholders = ",".join("?" * len(trigrams))
+            rows = self._connection.execute(
+                f"SELECT path FROM files WHERE id IN ("
+                f"SELECT file_id FROM postings WHERE trigram IN ({placeholders}) "
+                f"GROUP BY file_id HAVING COUNT(*) = ?)",
+                (*trigrams, len(trigrams)),
+            )
+            paths.update(path for (path,) in rows)
+        return paths
+
+    def narrow(
+        self,
+        files: Sequence[Path],
+        patterns: Iterable[Pattern[str] | Pattern[bytes]],
+        read: Callable[[Path], Optional[bytes]],
+    ) -> List[Path]:
+        """Return the subset of ``files`` that can match any of ``patterns``."""
+
+        query: Query = []
+        for pattern in patterns:
+            query = _or(query, regex_query(pattern))
+            if query is None:
+                return list(files)
+        self.update(files, read)
+        allowed = self.candidates(query)
+        return [file for file in files if str(file) in allowed]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+__all__ = ["TrigramIndex", "extract_trigrams", "regex_query"]
@@ -0,0 +1,203 @@
+"""Pruning directory walker used by :class:`~core.scanner.RepositoryScanner`.
+
+The walker is built on :func:`os.scandir`, never descends into excluded or
+ignored directories and honours ``.gitignore`` / ``.ignore`` files the way
+git does: patterns are relative to the file that declares them, the last
+matching pattern wins and deeper files override shallower ones.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+
+IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+_EXTENSION_PATTERN = re.compile(r"^\*(\.[^*?\[\]/\\.]+)$")
+
+
+@dataclass
+class IgnoreRule:
+    regex: Pattern[str]
+    negated: bool
+    directory_only: bool
+
+
+def _translate_segment(glob: str) -> str:
+    """Translate a gitignore glob into a regex where wildcards stop at ``/``."""
+
+    parts: List[str] = []
+    index, length = 0, len(glob)
+    while index < length:
+        char = glob[index]
+        if char == "*":
+            if glob.startswith("**", index):
+                before_ok = index == 0 or glob[index - 1] == "/"
+                after = index + 2
+                if before_ok and after < length and glob[after] == "/":
+                    parts.append("(?:.*/)?")
+                    index = after + 1
+                    continue
+                if before_ok and after == length:
+                    parts.append(".*")
+                    index = after
+                    continue
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = glob.find("]", index + 2 if glob.startswith("[!", index) or glob.startswith("[]", index) else index + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = glob[index + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                elif body.startswith("^"):
+                    body = "\\" + body
+                parts.append(f"[{body}]")
+                index = end
+        elif char == "\\" and index + 1 < length:
+            index += 1
+            parts.append(re.escape(glob[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def parse_ignore_lines(lines: Iterable[str]) -> List[IgnoreRule]:
+    """Parse gitignore-syntax ``lines`` into ordered rules."""
+
+    rules: List[IgnoreRule] = []
+    for raw in lines:
+        line = raw.rstrip("\n").rstrip("\r")
+        if not line or line.startswith("#"):
+            continue
+        while line.endswith(" ") and not line.endswith("\\ "):
+            line = line[:-1]
+        negated = line.startswith("!")
+        if negated or line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        body = _translate_segment(line)
+        prefix = "" if anchored else "(?:.*/)?"
+        rules.append(
+            IgnoreRule(
+                regex=re.compile(f"^{prefix}{body}$", re.DOTALL),
+                negated=negated,
+                directory_only=directory_only,
+            )
+        )
+    return rules
+
+
+class IgnoreStack:
+    """Ignore rules collected along the current descent path."""
+
+    def __init__(self, levels: Tuple[Tuple[str, List[IgnoreRule]], ...] = ()) -> None:
+        self.levels = levels
+
+    def push(self, directory: str, rules: List[IgnoreRule]) -> "IgnoreStack":
+        if not rules:
+            return self
+        return IgnoreStack((*self.levels, (directory, rules)))
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        for base, rules in reversed(self.levels):
+            relative = path[len(base) + 1:] if base else path
+            for rule in reversed(rules):
+                if rule.directory_only and not is_dir:
+                    continue
+                if rule.regex.match(relative):
+                    return not rule.negated
+        return False
+
+
+def _load_ignore_rules(directory: str, names: Iterable[str]) -> List[IgnoreRule]:
+    rules: List[IgnoreRule] = []
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8", errors="ignore") as handle:
+                rules.extend(parse_ignore_lines(handle))
+        except OSError:
+            continue
+    return rules
+
+
+class FileMatcher:
+    """Match file names against glob patterns, using a set for ``*.ext``."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.extensions = set()
+        globs = []
+        for pattern in patterns:
+            match = _EXTENSION_PATTERN.match(pattern)
+            if match:
+                self.extensions.add(match.group(1))
+            else:
+                globs.append(fnmatch.translate(pattern))
+        self.regex: Optional[Pattern[str]] = re.compile("|".join(globs)) if globs else None
+
+    def __call__(self, name: str) -> bool:
+        dot = name.rfind(".")
+        if dot != -1 and name[dot:] in self.extensions:
+            return True
+        return self.regex is not None and self.regex.match(name) is not None
+
+
+def walk_files(
+    root: Path | str,
+    patterns: Iterable[str],
+    exclude_dirs: Iterable[str],
+    use_ignore_files: bool = True,
+) -> Iterator[Path]:
+    """Yield files under ``root`` matching ``patterns`` in sorted, depth-first order."""
+
+    matcher = FileMatcher(patterns)
+    excluded = set(exclude_dirs)
+    root_str = os.fspath(root)
+    base_rules: List[IgnoreRule] = []
+    if use_ignore_files:
+        base_rules = _load_ignore_rules(os.path.join(root_str, ".git", "info"), ("exclude",))
+    stack: List[Tuple[str, str, IgnoreStack]] = [(root_str, "", IgnoreStack().push("", base_rules))]
+    while stack:
+        directory, relative, ignores = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        if use_ignore_files:
+            present = [entry.name for entry in entries if entry.name in IGNORE_FILE_NAMES]
+            if present:
+                ignores = ignores.push(relative, _load_ignore_rules(directory, sorted(present, key=IGNORE_FILE_NAMES.index)))
+        subdirectories: List[Tuple[str, str, IgnoreStack]] = []
+        for entry in entries:
+            name = entry.name
+            entry_relative = f"{relative}/{name}" if relative else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name in excluded or (ignores.levels and ignores.is_ignored(entry_relative, True)):
+                        continue
+                    subdirectories.append((entry.path, entry_relative, ignores))
+                    continue
+                if not matcher(name) or not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if ignores.levels and ignores.is_ignored(entry_relative, False):
+                continue
+            yield Path(entry.path)
+        stack.extend(reversed(subdirectories))
+
+
+__all__ = ["FileMatcher", "IgnoreRule", "IgnoreStack", "parse_ignore_lines", "walk_files"]
@@ -0,0 +1,377 @@
+"""Keep a :class:`~core.selfaudit.SelfAuditor` result hot while the tree changes.
+
+:class:`AuditWatcher` runs one full audit, then follows filesystem events
+and re-audits only the files they touch. On Linux the events come from
+inotify (through ``ctypes``, no extra dependency); elsewhere, or when
+inotify is unavailable, the tracked files are polled for metadata changes.
+The current issue set stays in memory and :meth:`AuditWatcher.snapshot`
+returns it without touching the disk.
+
+Edits to already tracked files take the fast path: only those files are
+read again. A path the watcher has not seen before (a new file, a new
+directory, a changed ignore file or archive) triggers a walk of the tree,
+which reads no file contents, to pick up additions and removals. The
+polling fallback only sees audited files, so ignore-file edits take effect
+with the next addition or :meth:`AuditWatcher.refresh` call.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .archives import ARCHIVE_PATTERNS, split_member
+from .scanner import DEFAULT_FILE_PATTERNS, EXCLUDED_DIRECTORIES, HIGH_RISK_PATTERNS
+from .walker import IGNORE_FILE_NAMES, FileMatcher
+
+if TYPE_CHECKING:
+    from .selfaudit import AuditIssue, SelfAuditor
+
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 0.05
+
+# Subset of <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+# ``None`` from a change source means "lost track, rescan everything".
+Changes = Optional[Set[Path]]
+
+
+class _InotifySource:
+    """Recursive inotify watches on every non-excluded directory under ``root``."""
+
+    def __init__(self, root: Path, exclude_dirs: Iterable[str]) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._excluded = set(exclude_dirs)
+        self._watches: Dict[int, str] = {}
+        try:
+            self._add_tree(str(root))
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(error, os.strerror(error))
+        self._watches[wd] = directory
+
+    def _remove_tree(self, directory: str) -> None:
+        """Drop the watches of ``directory`` and everything below it (it left the tree)."""
+
+        prefix = directory + os.sep
+        for wd, watched in list(self._watches.items()):
+            if watched == directory or watched.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _add_tree(self, directory: str) -> None:
+        for current, subdirectories, _files in os.walk(directory):
+            subdirectories[:] = [
+                name
+                for name in subdirectories
+                if name not in self._excluded and not os.path.islink(os.path.join(current, name))
+            ]
+            self._add(current)
+
+    def wait(self, timeout: float) -> Changes:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        touched: Set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    if os.path.basename(path) not in self._excluded:
+                        self._add_tree(path)
+                elif mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                    # The moved watches would keep reporting under the old path.
+                    self._remove_tree(path)
+                touched.add(Path(path))
+        return None if overflow else touched
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingSource:
+    """Compare file metadata between walks of the tree."""
+
+    def __init__(self, list_files: Callable[[], Iterable[Path]], stop: threading.Event) -> None:
+        self._list_files = list_files
+        self._stop = stop
+        self._state = self._snapshot()
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int, int]]:
+        state: Dict[Path, Tuple[int, int, int]] = {}
+        for path in self._list_files():
+            member = split_member(path)
+            target = member[0] if member is not None else path
+            if target in state:
+                continue
+            try:
+                stat = target.stat()
+            except OSError:
+                continue
+            state[target] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        return state
+
+    def wait(self, timeout: float) -> Changes:
+        if self._stop.wait(timeout):
+            return set()
+        state = self._snapshot()
+        previous, self._state = self._state, state
+        return {path for path in previous.keys() | state.keys() if previous.get(path) != state.get(path)}
+
+    def close(self) -> None:
+        pass
+
+
+class AuditWatcher:
+    """Maintain the issue set of ``auditor`` incrementally in a background thread.
+
+    ``backend`` is ``"auto"`` (inotify, falling back to polling), ``"inotify"``
+    or ``"poll"``. While running, the watcher owns the auditor's scanner; read
+    results through :meth:`snapshot` rather than calling the auditor directly.
+
+    A refresh that fails in the background (a file vanishing mid-read, for
+    example) does not stop the watcher: the error is counted in ``errors``
+    and kept as ``last_error``, and the next cycle re-audits the whole tree.
+    ``last_error`` is cleared once a refresh succeeds again.
+    """
+
+    def __init__(
+        self,
+        auditor: SelfAuditor,
+        required_files: Optional[Iterable[str]] = None,
+        backend: str = "auto",
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> None:
+        if backend not in ("auto", "inotify", "poll"):
+            raise ValueError(f"Unknown watch backend {backend!r}")
+        self.auditor = auditor
+        self.required_files = tuple(required_files or ())
+        self.backend = backend
+        self.interval = interval
+        self.debounce = debounce
+        self.generation = 0
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+        self._order: Dict[Path, int] = {}
+        self._tracked_dirs: Set[Path] = set()
+        self._by_path: Dict[Path, List[AuditIssue]] = {}
+        self._missing: List[AuditIssue] = []
+        self._snapshot: List[AuditIssue] = []
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._source: Optional[object] = None
+        self._candidates = FileMatcher((*DEFAULT_FILE_PATTERNS, *ARCHIVE_PATTERNS))
+
+    # ------------------------------------------------------------------
+    def start(self) -> "AuditWatcher":
+        """Run the initial full audit and begin following changes."""
+
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._source = self._open_source()
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="kai-audit-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._source is not None:
+            self._source.close()  # type: ignore[attr-defined]
+            self._source = None
+
+    def __enter__(self) -> "AuditWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _open_source(self) -> object:
+        scanner = self.auditor.scanner
+        if self.backend in ("auto", "inotify"):
+            try:
+                return _InotifySource(scanner.root, EXCLUDED_DIRECTORIES)
+            except (OSError, AttributeError):
+                if self.backend == "inotify":
+                    raise
+        return _PollingSource(scanner.iter_files, self._stop)
+
+    def _run(self) -> None:
+        source = self._source
+        failed = False
+        while not self._stop.is_set():
+            touched = source.wait(self.interval)  # type: ignore[attr-defined]
+            if failed:
+                # Whatever the failed refresh left half done is redone in full.
+                touched = None
+            elif touched is not None and not touched:
+                continue
+            if touched is not None and self.debounce:
+                # Editors often save in several steps; take them as one batch.
+                more = source.wait(self.debounce)  # type: ignore[attr-defined]
+                touched = None if more is None else touched | more
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh(touched)
+            except Exception as error:  # the thread must outlive any single refresh
+                failed = True
+                with self._condition:
+                    self.errors += 1
+                    self.last_error = error
+            else:
+                failed = False
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> List[AuditIssue]:
+        """The current issues, ordered as :meth:`SelfAuditor.audit` orders them."""
+
+        with self._condition:
+            return list(self._snapshot)
+
+    def wait_for_change(self, generation: int, timeout: Optional[float] = None) -> int:
+        """Block until the issue set is newer than ``generation``; return the latest."""
+
+        with self._condition:
+            self._condition.wait_for(lambda: self.generation > generation, timeout)
+            return self.generation
+
+    def refresh(self, touched: Optional[Iterable[Path]] = None) -> None:
+        """Re-audit ``touched`` paths, or the whole tree when ``None``."""
+
+        scanner = self.auditor.scanner
+        previous = self._order
+        if touched is None:
+            order = {path: index for index, path in enumerate(scanner.iter_files())}
+            targets = list(order)
+        else:
+            touched = {Path(path) for path in touched}
+            if any(
+                path not in previous and (path in self._tracked_dirs or self._may_add_files(path)) for path in touched
+            ):
+                order = {path: index for index, path in enumerate(scanner.iter_files())}
+                targets = [
+                    path
+                    for path in order
+                    if path in touched or path not in previous or _archive_of(path) in touched
+                ]
+            else:
+                order = previous
+                targets = [path for path in touched if path in previous]
+                if not targets and not touched.intersection(scanner.root / name for name in self.required_files):
+                    return
+        gone = [path for path in previous if path not in order]
+        present = [path for path in targets if _archive_of(path) is not None or path.exists()]
+        gone.extend(path for path in targets if path not in present)
+        issues = self.auditor.run_static_checks(files=present)
+        missing = self.auditor.verify_mandatory_files(self.required_files) if self.required_files else []
+
+        found: Dict[Path, List[AuditIssue]] = {}
+        for issue in issues:
+            found.setdefault(scanner.root / issue.path, []).append(issue)  # type: ignore[operator]
+        with self._condition:
+            by_path = self._by_path
+            for path in gone:
+                by_path.pop(path, None)
+            for path in present:
+                if path in found:
+                    by_path[path] = found[path]
+                else:
+                    by_path.pop(path, None)
+            self._order = {path: index for index, path in enumerate(path for path in order if path not in gone)}
+            if order is not previous or gone:
+                self._tracked_dirs = {parent for path in self._order for parent in path.parents}
+            self._missing = missing
+            self._snapshot = self._ordered()
+            self.last_error = None
+            self.generation += 1
+            self._condition.notify_all()
+
+    def _may_add_files(self, path: Path) -> bool:
+        """Whether an unknown touched path can change the set of audited files.
+
+        Directories that hold tracked files are handled by the caller, since
+        one moved or deleted no longer exists to be recognised as a directory.
+        """
+
+        return path.name in IGNORE_FILE_NAMES or self._candidates(path.name) or path.is_dir()
+
+    def _ordered(self) -> List[AuditIssue]:
+        by_category: Dict[Optional[str], List[AuditIssue]] = {category: [] for category in HIGH_RISK_PATTERNS}
+        order = self._order
+        for path in sorted(self._by_path, key=lambda path: order.get(path, len(order))):
+            for issue in self._by_path[path]:
+                by_category.setdefault(issue.category, []).append(issue)
+        return [*(issue for issues in by_category.values() for issue in issues), *self._missing]
+
+
+def _archive_of(path: Path) -> Optional[Path]:
+    member = split_member(path)
+    return member[0] if member is not None else None
+
+
+__all__ = ["AuditWatcher"]